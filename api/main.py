@@ -1,15 +1,30 @@
 from __future__ import annotations
 
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from api.routes.health import router as health_router
 from api.routes.scanner import router as scanner_router
+from api.services.scanner_service import scanner_service
+
+
+@asynccontextmanager
+async def lifespan(_: FastAPI) -> AsyncIterator[None]:
+    await scanner_service.startup()
+    try:
+        yield
+    finally:
+        await scanner_service.shutdown()
+
 
 app = FastAPI(
     title="Stock Trend Scanner API",
     description="FastAPI wrapper around the preserved Python stock scanner logic.",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
 app.add_middleware(
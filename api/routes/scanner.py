@@ -1,13 +1,26 @@
 from __future__ import annotations
 
 from datetime import date
+from typing import Literal
 
-from fastapi import APIRouter, HTTPException
-from fastapi.responses import Response
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import PlainTextResponse, Response
 
+from api.scanner.results import CursorError
 from api.scanner.universes import UniverseNotFoundError
-from api.schemas.scanner import ScanRequest, ScanResponse, UniverseOption
-from api.services.scanner_service import scanner_service
+from api.schemas.scanner import (
+    EnteredTopResponse,
+    HistoryScan,
+    ProfileResponse,
+    ResultsPage,
+    ScanRequest,
+    ScanResponse,
+    StoredScan,
+    TickerBarsResponse,
+    TickerHistoryResponse,
+    UniverseOption,
+)
+from api.services.scanner_service import HistoryNotFoundError, ProfileNotFoundError, ScanOptionsError, ScanResultsNotFoundError, TickerNotFoundError, scanner_service
 
 router = APIRouter(prefix="/scanner", tags=["scanner"])
 
@@ -18,17 +31,28 @@ def list_universes() -> list[UniverseOption]:
 
 
 @router.post("/run", response_model=ScanResponse)
-def run_scan_endpoint(request: ScanRequest) -> ScanResponse:
+async def run_scan_endpoint(request: ScanRequest) -> ScanResponse:
     try:
-        return ScanResponse(**scanner_service.run_scan(request.universe, request.mode))
+        payload = await scanner_service.run_scan_async(
+            request.universe,
+            request.mode,
+            delta=request.delta,
+            distributed=request.distributed,
+            limit=request.limit,
+            profile=request.profile,
+            deadline_ms=request.deadline_ms,
+        )
+        return ScanResponse(**payload)
     except UniverseNotFoundError as exc:
         raise HTTPException(status_code=404, detail=str(exc)) from exc
+    except ScanOptionsError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
 
 
 @router.post("/export")
-def export_scan(request: ScanRequest) -> Response:
+async def export_scan(request: ScanRequest) -> Response:
     try:
-        content = scanner_service.export_csv(request.universe, request.mode)
+        content = await scanner_service.export_csv_async(request.universe, request.mode)
     except UniverseNotFoundError as exc:
         raise HTTPException(status_code=404, detail=str(exc)) from exc
     filename = f"scanner-results-{request.universe}-{request.mode}-{date.today().isoformat()}.csv"
@@ -37,3 +61,112 @@ def export_scan(request: ScanRequest) -> Response:
         media_type="text/csv",
         headers={"Content-Disposition": f'attachment; filename=\"{filename}\"'},
     )
+
+
+@router.get("/ticker/{symbol}/bars", response_model=TickerBarsResponse)
+async def ticker_bars(
+    symbol: str,
+    mode: Literal["live", "sample", "record", "replay"] = "sample",
+    max_points: int = Query(default=500, ge=2, le=5000),
+    method: Literal["ohlc", "lttb"] = "ohlc",
+    start: date | None = None,
+    end: date | None = None,
+) -> TickerBarsResponse:
+    try:
+        return TickerBarsResponse(**await scanner_service.ticker_bars(symbol, mode, max_points=max_points, method=method, start=start, end=end))
+    except TickerNotFoundError as exc:
+        raise HTTPException(status_code=404, detail=str(exc)) from exc
+
+
+@router.get("/results/{scan_id}", response_model=ResultsPage)
+async def query_results(
+    scan_id: str,
+    sort: Literal["rank", "ticker", "score", "gap_pct", "rel_dollar_vol", "avg20_dollar_vol", "price", "premarket_last"] = "rank",
+    order: Literal["asc", "desc"] | None = None,
+    min_score: float | None = None,
+    max_score: float | None = None,
+    min_gap_pct: float | None = None,
+    max_gap_pct: float | None = None,
+    min_rel_dollar_vol: float | None = None,
+    max_rel_dollar_vol: float | None = None,
+    min_price: float | None = None,
+    max_price: float | None = None,
+    reason: list[str] = Query(default=[]),
+    limit: int = Query(default=50, ge=1, le=1000),
+    cursor: str | None = None,
+) -> ResultsPage:
+    # Rank and ticker read best-first / A-Z by default, metrics largest first.
+    descending = order == "desc" if order else sort not in {"rank", "ticker"}
+    ranges = {
+        "score": (min_score, max_score),
+        "gap_pct": (min_gap_pct, max_gap_pct),
+        "rel_dollar_vol": (min_rel_dollar_vol, max_rel_dollar_vol),
+        "price": (min_price, max_price),
+    }
+    try:
+        page = await scanner_service.query_results(scan_id, sort, descending, ranges, reason, limit, cursor)
+    except ScanResultsNotFoundError as exc:
+        raise HTTPException(status_code=404, detail=str(exc)) from exc
+    except CursorError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    return ResultsPage(**page)
+
+
+@router.get("/profiles/{profile_id}", response_model=ProfileResponse)
+async def get_profile(profile_id: str) -> ProfileResponse:
+    try:
+        return ProfileResponse(**await scanner_service.get_profile(profile_id))
+    except ProfileNotFoundError as exc:
+        raise HTTPException(status_code=404, detail=str(exc)) from exc
+
+
+@router.get("/profiles/{profile_id}/collapsed", response_class=PlainTextResponse)
+async def get_profile_stacks(profile_id: str) -> str:
+    """Collapsed stacks only, ready for flamegraph.pl or speedscope."""
+    try:
+        return (await scanner_service.get_profile(profile_id))["collapsed"]
+    except ProfileNotFoundError as exc:
+        raise HTTPException(status_code=404, detail=str(exc)) from exc
+
+
+@router.get("/history/ticker/{symbol}", response_model=TickerHistoryResponse)
+async def ticker_history(
+    symbol: str,
+    limit: int = Query(default=30, ge=1, le=1000),
+    universe: str | None = None,
+    mode: str | None = None,
+    per_day: bool = True,
+) -> TickerHistoryResponse:
+    try:
+        return TickerHistoryResponse(**await scanner_service.ticker_history(symbol, limit=limit, universe=universe, mode=mode, per_day=per_day))
+    except HistoryNotFoundError as exc:
+        raise HTTPException(status_code=404, detail=str(exc)) from exc
+
+
+@router.get("/history/entered-top", response_model=EnteredTopResponse)
+async def entered_top(
+    universe: str,
+    top: int = Query(default=20, ge=1, le=1000),
+    day: date | None = None,
+    mode: str | None = None,
+) -> EnteredTopResponse:
+    try:
+        return EnteredTopResponse(**await scanner_service.entered_top(universe, top=top, day=day, mode=mode))
+    except HistoryNotFoundError as exc:
+        raise HTTPException(status_code=404, detail=str(exc)) from exc
+
+
+@router.get("/history/scans", response_model=list[HistoryScan])
+async def history_scans(universe: str | None = None, mode: str | None = None, limit: int = Query(default=50, ge=1, le=1000)) -> list[HistoryScan]:
+    try:
+        return [HistoryScan(**item) for item in await scanner_service.history_scans(universe, mode, limit)]
+    except HistoryNotFoundError as exc:
+        raise HTTPException(status_code=404, detail=str(exc)) from exc
+
+
+@router.get("/history/scans/{scan_id}", response_model=StoredScan)
+async def history_scan(scan_id: str) -> StoredScan:
+    try:
+        return StoredScan(**await scanner_service.history_scan(scan_id))
+    except HistoryNotFoundError as exc:
+        raise HTTPException(status_code=404, detail=str(exc)) from exc
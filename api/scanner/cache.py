@@ -0,0 +1,352 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import hashlib
+import json
+import mmap
+import os
+import pickle
+import struct
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Iterator
+
+from .config import ROOT_DIR
+from .singleflight import AsyncSingleFlight
+
+# Namespaces used by the scanner. Each one gets its own TTL in config.yaml.
+BARS = "bars"
+FEATURES = "features"
+SCANS = "scans"
+RESULTS = "results"
+PROFILES = "profiles"
+LIQUIDITY = "liquidity"
+
+_MAGIC = b"STSC1"
+_HEADER = struct.Struct("<5sI")
+_ALIGN = 64
+
+
+class CacheBackend:
+    """Key/value store for bars, features and scan results; a ``ttl`` of ``None`` or 0 never expires."""
+
+    def get(self, namespace: str, key: str) -> Any | None:
+        raise NotImplementedError
+
+    def set(self, namespace: str, key: str, value: Any, ttl: float | None = None) -> None:
+        raise NotImplementedError
+
+    def delete(self, namespace: str, key: str) -> None:
+        raise NotImplementedError
+
+    async def get_or_set_async(
+        self,
+        namespace: str,
+        key: str,
+        compute: Callable[[], Awaitable[Any]],
+        ttl: float | None = None,
+        store_if: Callable[[Any], bool] | None = None,
+    ) -> Any:
+        """Cached value, or the result of awaiting ``compute`` (stored if ``store_if`` allows)."""
+        value = await asyncio.to_thread(self.get, namespace, key)
+        if value is not None:
+            return value
+        value = await compute()
+        if value is not None and (store_if is None or store_if(value)):
+            await asyncio.to_thread(self.set, namespace, key, value, ttl)
+        return value
+
+
+class NullCache(CacheBackend):
+    def get(self, namespace: str, key: str) -> Any | None:
+        return None
+
+    def set(self, namespace: str, key: str, value: Any, ttl: float | None = None) -> None:
+        return None
+
+    def delete(self, namespace: str, key: str) -> None:
+        return None
+
+    async def get_or_set_async(
+        self,
+        namespace: str,
+        key: str,
+        compute: Callable[[], Awaitable[Any]],
+        ttl: float | None = None,
+        store_if: Callable[[Any], bool] | None = None,
+    ) -> Any:
+        return await compute()
+
+
+def _expires_at(ttl: float | None) -> float:
+    return time.time() + float(ttl) if ttl else 0.0
+
+
+def _is_expired(expires_at: float) -> bool:
+    return bool(expires_at) and expires_at < time.time()
+
+
+@contextlib.contextmanager
+def file_lock(path: Path, remove: bool = False) -> Iterator[None]:
+    """Exclusive advisory lock on ``path`` for every process on the host; ``remove`` deletes it on release."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if os.name == "nt":
+        import msvcrt
+
+        with open(path, "a+b") as handle:
+            handle.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(handle.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    continue
+            try:
+                yield
+            finally:
+                handle.seek(0)
+                msvcrt.locking(handle.fileno(), msvcrt.LK_UNLCK, 1)
+        return
+
+    import fcntl
+
+    while True:
+        handle = open(path, "a+b")
+        fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+        try:
+            current = os.stat(path)
+        except FileNotFoundError:
+            current = None
+        # A holder may have removed the file while we waited on the old inode.
+        if current is not None and current.st_ino == os.fstat(handle.fileno()).st_ino:
+            break
+        handle.close()
+    try:
+        yield
+    finally:
+        if remove:
+            with contextlib.suppress(OSError):
+                os.unlink(path)
+        fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+        handle.close()
+
+
+def atomic_write(path: Path, chunks: list[bytes | memoryview]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=path.parent)
+    try:
+        with os.fdopen(fd, "wb") as handle:
+            for chunk in chunks:
+                handle.write(chunk)
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(tmp_name, path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.unlink(tmp_name)
+        raise
+
+
+class DiskCache(CacheBackend):
+    """Host-local cache shared by every worker on the machine; reads are memory-mapped, so arrays are read-only."""
+
+    def __init__(self, root: str | Path, use_mmap: bool = True, sweep_interval_s: float = 600) -> None:
+        self.root = Path(root)
+        self.use_mmap = use_mmap
+        self.sweep_interval_s = sweep_interval_s
+        self._next_sweep = time.monotonic() + sweep_interval_s
+        self._flights = AsyncSingleFlight()
+
+    def _path(self, namespace: str, key: str) -> Path:
+        digest = hashlib.sha1(key.encode("utf-8")).hexdigest()
+        return self.root / namespace / digest[:2] / f"{digest}.bin"
+
+    def get(self, namespace: str, key: str) -> Any | None:
+        path = self._path(namespace, key)
+        try:
+            with open(path, "rb") as handle:
+                if self.use_mmap:
+                    data: Any = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+                else:
+                    data = handle.read()
+        except (OSError, ValueError):
+            return None
+        try:
+            return self._decode(memoryview(data))
+        except Exception:
+            return None
+
+    def set(self, namespace: str, key: str, value: Any, ttl: float | None = None) -> None:
+        try:
+            atomic_write(self._path(namespace, key), self._encode(value, _expires_at(ttl)))
+        except (OSError, pickle.PicklingError):
+            # The cache is an optimisation; a failed write (full disk, file
+            # mapped by a reader on Windows) must never fail the scan.
+            pass
+        if self.sweep_interval_s and time.monotonic() >= self._next_sweep:
+            self._next_sweep = time.monotonic() + self.sweep_interval_s
+            self.sweep()
+
+    def sweep(self) -> int:
+        """Delete expired entries and abandoned temp files; returns how many files went."""
+        removed = 0
+        stale_tmp = time.time() - 3600
+        for path in self.root.glob("*/*/*"):
+            try:
+                if path.suffix == ".bin":
+                    with open(path, "rb") as handle:
+                        magic, meta_len = _HEADER.unpack(handle.read(_HEADER.size))
+                        expired = magic != _MAGIC or _is_expired(json.loads(handle.read(meta_len))["expires_at"])
+                elif path.suffix == ".tmp":
+                    expired = path.stat().st_mtime < stale_tmp
+                else:
+                    continue
+                if expired:
+                    path.unlink()
+                    removed += 1
+            except (OSError, ValueError, KeyError, struct.error):
+                # Gone already, or mapped by a reader on Windows; the next sweep retries.
+                continue
+        return removed
+
+    def delete(self, namespace: str, key: str) -> None:
+        with contextlib.suppress(FileNotFoundError):
+            self._path(namespace, key).unlink()
+
+    async def get_or_set_async(
+        self,
+        namespace: str,
+        key: str,
+        compute: Callable[[], Awaitable[Any]],
+        ttl: float | None = None,
+        store_if: Callable[[Any], bool] | None = None,
+    ) -> Any:
+        value = await asyncio.to_thread(self.get, namespace, key)
+        if value is not None:
+            return value
+        # Every waiter would hold a thread while it blocks on the lock; enough
+        # same-key misses would take the whole default executor, including the
+        # thread the holder needs to finish.
+        return await self._flights.do((namespace, key), self._get_or_set_locked, namespace, key, compute, ttl, store_if)
+
+    async def _get_or_set_locked(
+        self,
+        namespace: str,
+        key: str,
+        compute: Callable[[], Awaitable[Any]],
+        ttl: float | None,
+        store_if: Callable[[Any], bool] | None,
+    ) -> Any:
+        # Wait for the lock on a worker thread; the coroutine computing the
+        # value keeps running on the loop while it is held.
+        lock = file_lock(self._path(namespace, key).with_suffix(".lock"), remove=True)
+        await asyncio.to_thread(lock.__enter__)
+        try:
+            value = await asyncio.to_thread(self.get, namespace, key)
+            if value is not None:
+                return value
+            value = await compute()
+            if value is not None and (store_if is None or store_if(value)):
+                await asyncio.to_thread(self.set, namespace, key, value, ttl)
+            return value
+        finally:
+            lock.__exit__(None, None, None)
+
+    @staticmethod
+    def _encode(value: Any, expires_at: float) -> list[bytes | memoryview]:
+        buffers: list[pickle.PickleBuffer] = []
+        payload = pickle.dumps(value, protocol=5, buffer_callback=buffers.append)
+        raws = [buffer.raw() for buffer in buffers]
+        meta = json.dumps({"expires_at": expires_at, "payload": len(payload), "buffers": [raw.nbytes for raw in raws]}).encode("utf-8")
+
+        chunks: list[bytes | memoryview] = [_HEADER.pack(_MAGIC, len(meta)), meta, payload]
+        offset = _HEADER.size + len(meta) + len(payload)
+        for raw in raws:
+            padding = -offset % _ALIGN
+            chunks.append(b"\0" * padding)
+            chunks.append(raw)
+            offset += padding + raw.nbytes
+        return chunks
+
+    @staticmethod
+    def _decode(view: memoryview) -> Any | None:
+        magic, meta_len = _HEADER.unpack_from(view, 0)
+        if magic != _MAGIC:
+            return None
+        offset = _HEADER.size
+        meta = json.loads(bytes(view[offset : offset + meta_len]))
+        if _is_expired(meta["expires_at"]):
+            return None
+        offset += meta_len
+        payload = view[offset : offset + meta["payload"]]
+        offset += meta["payload"]
+        buffers = []
+        for size in meta["buffers"]:
+            offset += -offset % _ALIGN
+            buffers.append(view[offset : offset + size])
+            offset += size
+        return pickle.loads(payload, buffers=buffers)
+
+
+class NetworkCache(CacheBackend):
+    """Cache shared across hosts through a Redis-compatible client."""
+
+    def __init__(self, client: Any, prefix: str = "scanner") -> None:
+        self.client = client
+        self.prefix = prefix
+
+    @classmethod
+    def from_url(cls, url: str, prefix: str = "scanner") -> "NetworkCache":
+        try:
+            import redis
+        except Exception as exc:
+            raise RuntimeError("redis is not installed; install it to use the network cache backend") from exc
+        return cls(redis.Redis.from_url(url), prefix=prefix)
+
+    def _key(self, namespace: str, key: str) -> str:
+        return f"{self.prefix}:{namespace}:{key}"
+
+    def get(self, namespace: str, key: str) -> Any | None:
+        try:
+            raw = self.client.get(self._key(namespace, key))
+        except Exception:
+            return None
+        if raw is None:
+            return None
+        try:
+            return pickle.loads(raw)
+        except Exception:
+            return None
+
+    def set(self, namespace: str, key: str, value: Any, ttl: float | None = None) -> None:
+        try:
+            self.client.set(self._key(namespace, key), pickle.dumps(value, protocol=5), ex=int(ttl) if ttl else None)
+        except Exception:
+            pass
+
+    def delete(self, namespace: str, key: str) -> None:
+        try:
+            self.client.delete(self._key(namespace, key))
+        except Exception:
+            pass
+
+
+def cache_ttl(cfg: dict[str, Any], namespace: str) -> float | None:
+    ttls = (cfg.get("cache") or {}).get("ttl_seconds") or {}
+    value = ttls.get(namespace)
+    return float(value) if value else None
+
+
+def build_cache(cfg: dict[str, Any]) -> CacheBackend:
+    settings = cfg.get("cache") or {}
+    backend = str(settings.get("backend", "none")).lower()
+    if backend == "disk":
+        path = Path(settings.get("path", ".cache/scanner"))
+        if not path.is_absolute():
+            path = ROOT_DIR / path
+        return DiskCache(path, use_mmap=bool(settings.get("mmap", True)), sweep_interval_s=float(settings.get("sweep_interval_s", 600)))
+    if backend == "network":
+        return NetworkCache.from_url(settings["url"], prefix=settings.get("prefix", "scanner"))
+    return NullCache()
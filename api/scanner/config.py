@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import hashlib
+import json
 from pathlib import Path
 from typing import Any
 
@@ -15,3 +17,8 @@ def load_config(path: Path | None = None) -> dict[str, Any]:
     config_path = path or CONFIG_PATH
     with config_path.open("r", encoding="utf-8") as handle:
         return yaml.safe_load(handle)
+
+
+def config_fingerprint(cfg: dict[str, Any]) -> str:
+    payload = json.dumps(cfg, sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:16]
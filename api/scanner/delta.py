@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import hashlib
+import threading
+from typing import Any
+
+from .ingest import BAR_COLUMNS, CompactBars
+
+
+def _last_bar_repr(bars: CompactBars | None, columns: list[str]) -> str:
+    if bars is None or bars.empty:
+        return ""
+    return f"{int(bars.ts[-1])}|{[bars.column(name)[-1].item() for name in columns]!r}"
+
+
+def bar_fingerprint(bars: dict[str, Any], cfg_key: str) -> str | None:
+    """Hash of the inputs that can change a ticker's score, or ``None`` for a failed fetch."""
+    if "error" in bars:
+        return None
+    daily = bars.get("daily")
+    intra = bars.get("intra")
+    parts = [
+        cfg_key,
+        str(len(daily)) if daily is not None else "0",
+        _last_bar_repr(daily, BAR_COLUMNS),
+        _last_bar_repr(intra, ["Volume"]),
+    ]
+    return hashlib.sha1("\n".join(parts).encode("utf-8")).hexdigest()
+
+
+class DeltaState:
+    """Rows from earlier scans keyed by input fingerprint; a stored ``None`` means the ticker was filtered out."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._entries: dict[str, tuple[str, dict[str, Any] | None]] = {}
+
+    def lookup(self, ticker: str, fingerprint: str | None) -> tuple[bool, dict[str, Any] | None]:
+        if fingerprint is None:
+            return False, None
+        with self._lock:
+            entry = self._entries.get(ticker)
+        if entry is None or entry[0] != fingerprint:
+            return False, None
+        return True, entry[1]
+
+    def store(self, ticker: str, fingerprint: str | None, row: dict[str, Any] | None) -> None:
+        if fingerprint is None:
+            return
+        with self._lock:
+            self._entries[ticker] = (fingerprint, row)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
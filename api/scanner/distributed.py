@@ -0,0 +1,210 @@
+from __future__ import annotations
+
+import collections
+import multiprocessing
+import queue
+import threading
+import time
+import uuid
+from typing import Any
+
+import pandas as pd
+
+from .engine import rank_rows, score_tickers, select_candidates
+
+
+class ShardFailedError(RuntimeError):
+    pass
+
+
+def shard_tickers(tickers: list[str], shard_size: int) -> list[list[str]]:
+    size = max(1, int(shard_size))
+    return [tickers[start : start + size] for start in range(0, len(tickers), size)]
+
+
+def scan_shard(tickers: list[str], cfg: dict[str, Any], mode: str) -> list[dict[str, Any]]:
+    scored, _, _ = score_tickers(tickers, cfg, mode=mode)
+    return select_candidates(scored, cfg)
+
+
+def worker_loop(tasks: Any, results: Any) -> None:
+    """Consume shard tasks until a ``None`` sentinel, acknowledging each with a ``started`` reply."""
+    while True:
+        task = tasks.get()
+        if task is None:
+            break
+        reply = {key: task[key] for key in ("scan_id", "shard_id", "attempt")}
+        results.put({**reply, "started": True})
+        try:
+            reply["rows"] = scan_shard(task["tickers"], task["cfg"], task["mode"])
+        except Exception as exc:
+            reply["error"] = f"{type(exc).__name__}: {exc}"
+        results.put(reply)
+
+
+class QueueBroker:
+    """Shard transport over any pair of queues; replies for other scans wait for their coordinator."""
+
+    def __init__(self, tasks: Any, results: Any) -> None:
+        self.tasks = tasks
+        self.results = results
+        self._lock = threading.Lock()
+        self._parked: dict[str, list[dict[str, Any]]] = {}
+        self._finished: collections.deque[str] = collections.deque(maxlen=256)
+
+    def put_task(self, task: dict[str, Any]) -> None:
+        self.tasks.put(task)
+
+    def get_result(self, scan_id: str, timeout: float) -> dict[str, Any] | None:
+        deadline = time.monotonic() + timeout
+        while True:
+            with self._lock:
+                parked = self._parked.get(scan_id)
+                if parked:
+                    return parked.pop(0)
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+            try:
+                reply = self.results.get(timeout=min(remaining, 0.05))
+            except queue.Empty:
+                continue
+            if reply.get("scan_id") == scan_id:
+                return reply
+            with self._lock:
+                if reply.get("scan_id") not in self._finished:
+                    self._parked.setdefault(reply.get("scan_id", ""), []).append(reply)
+
+    def discard(self, scan_id: str) -> None:
+        with self._lock:
+            self._parked.pop(scan_id, None)
+            self._finished.append(scan_id)
+
+    def close(self) -> None:
+        return None
+
+
+class ThreadBroker(QueueBroker):
+    """In-process broker for tests and small hosts."""
+
+    def __init__(self, workers: int = 2) -> None:
+        super().__init__(queue.Queue(), queue.Queue())
+        self.threads = [threading.Thread(target=worker_loop, args=(self.tasks, self.results), daemon=True) for _ in range(workers)]
+        for thread in self.threads:
+            thread.start()
+
+    def close(self) -> None:
+        for _ in self.threads:
+            self.tasks.put(None)
+        for thread in self.threads:
+            thread.join()
+
+
+class MultiprocessingBroker(QueueBroker):
+    """Worker processes fed from a multiprocessing queue; dead workers are replaced on the next poll."""
+
+    def __init__(self, workers: int | None = None) -> None:
+        context = multiprocessing.get_context("spawn")
+        super().__init__(context.Queue(), context.Queue())
+        self._context = context
+        self._processes = [self._spawn() for _ in range(workers or max(1, (multiprocessing.cpu_count() or 2) - 1))]
+
+    def _spawn(self) -> Any:
+        process = self._context.Process(target=worker_loop, args=(self.tasks, self.results), daemon=True)
+        process.start()
+        return process
+
+    def get_result(self, scan_id: str, timeout: float) -> dict[str, Any] | None:
+        with self._lock:
+            self._processes = [process if process.is_alive() else self._spawn() for process in self._processes]
+        return super().get_result(scan_id, timeout)
+
+    def close(self) -> None:
+        for _ in self._processes:
+            self.tasks.put(None)
+        for process in self._processes:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+
+
+def run_distributed_scan(
+    tickers: list[str],
+    cfg: dict[str, Any],
+    mode: str = "live",
+    broker: QueueBroker | None = None,
+) -> pd.DataFrame:
+    """Scan ``tickers`` in shards on a broker's workers and merge the ranking, retrying failed shards."""
+    settings = cfg.get("distributed") or {}
+    max_retries = int(settings.get("max_retries", 2))
+    shard_timeout = float(settings.get("shard_timeout_s", 120))
+    owned = broker is None
+    broker = broker or MultiprocessingBroker(settings.get("workers"))
+
+    scan_id = uuid.uuid4().hex
+    shards = shard_tickers(tickers, settings.get("shard_size", 50))
+    attempts: dict[int, int] = {}
+    deadlines: dict[int, float] = {}
+    queued: dict[int, float] = {}
+    failures: dict[int, str] = {}
+    merged: dict[int, list[dict[str, Any]]] = {}
+
+    def submit(shard_id: int) -> None:
+        attempts[shard_id] = attempts.get(shard_id, -1) + 1
+        if attempts[shard_id] > max_retries:
+            reason = failures.get(shard_id, "timed out")
+            raise ShardFailedError(f"Shard {shard_id} failed after {max_retries + 1} attempts: {reason}")
+        # The clock starts when a worker reports the shard as started.
+        deadlines.pop(shard_id, None)
+        queued[shard_id] = time.monotonic()
+        broker.put_task(
+            {
+                "scan_id": scan_id,
+                "shard_id": shard_id,
+                "attempt": attempts[shard_id],
+                "tickers": shards[shard_id],
+                "cfg": cfg,
+                "mode": mode,
+            }
+        )
+
+    try:
+        for shard_id in range(len(shards)):
+            submit(shard_id)
+        last_reply = time.monotonic()
+        while len(merged) < len(shards):
+            reply = broker.get_result(scan_id, timeout=0.2)
+            if reply is not None:
+                last_reply = time.monotonic()
+            if reply is not None and reply["shard_id"] not in merged:
+                if reply.get("started"):
+                    if reply["attempt"] == attempts[reply["shard_id"]]:
+                        queued.pop(reply["shard_id"], None)
+                        deadlines[reply["shard_id"]] = time.monotonic() + shard_timeout
+                elif "error" in reply:
+                    if reply["attempt"] == attempts[reply["shard_id"]]:
+                        failures[reply["shard_id"]] = reply["error"]
+                        submit(reply["shard_id"])
+                else:
+                    merged[reply["shard_id"]] = reply["rows"]
+                    queued.pop(reply["shard_id"], None)
+            now = time.monotonic()
+            for shard_id, deadline in list(deadlines.items()):
+                if shard_id not in merged and now > deadline:
+                    failures[shard_id] = "timed out"
+                    submit(shard_id)
+            running = any(shard_id not in merged for shard_id in deadlines)
+            if queued and not running and now - max(last_reply, *queued.values()) > shard_timeout:
+                # Nothing of this scan is running and nothing has been heard or
+                # sent for a whole shard timeout: the queued tasks were lost (a
+                # worker died before acknowledging, or the broker dropped them).
+                for shard_id in sorted(queued):
+                    failures[shard_id] = "never picked up by a worker"
+                    submit(shard_id)
+    finally:
+        if owned:
+            broker.close()
+        else:
+            broker.discard(scan_id)
+
+    return rank_rows([row for rows in merged.values() for row in rows], cfg)
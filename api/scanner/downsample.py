@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+from typing import Sequence
+
+import numpy as np
+import pandas as pd
+
+
+def bucket_starts(length: int, buckets: int) -> np.ndarray:
+    """First row of each of ``buckets`` near-equal, contiguous row ranges."""
+    return np.unique(np.linspace(0, length, max(1, buckets) + 1).astype(np.int64)[:-1])
+
+
+def ohlc_buckets(frame: pd.DataFrame, max_points: int, overlays: Sequence[str] = ()) -> pd.DataFrame:
+    """Merge consecutive bars into at most ``max_points`` candles, keeping every wick."""
+    length = len(frame)
+    if length <= max_points:
+        return frame
+    starts = bucket_starts(length, max_points)
+    ends = np.append(starts[1:], length) - 1
+
+    def column(name: str) -> np.ndarray:
+        return frame[name].to_numpy(dtype=np.float64)
+
+    merged = {
+        "Open": column("Open")[starts],
+        "High": np.fmax.reduceat(column("High"), starts),
+        "Low": np.fmin.reduceat(column("Low"), starts),
+        "Close": column("Close")[ends],
+        "Volume": np.add.reduceat(np.nan_to_num(column("Volume")), starts),
+    }
+    for name in overlays:
+        merged[name] = column(name)[ends]
+    return pd.DataFrame(merged, index=frame.index[starts])
+
+
+def lttb_indices(values: np.ndarray, max_points: int) -> np.ndarray:
+    """Rows picked by Largest-Triangle-Three-Buckets on ``values``."""
+    length = len(values)
+    if length <= max_points or max_points < 3:
+        return np.arange(length) if length <= max_points else np.array([0, length - 1])
+    y = pd.Series(values, dtype=np.float64).ffill().bfill().fillna(0.0).to_numpy()
+    x = np.arange(length, dtype=np.float64)
+    edges = np.linspace(1, length - 1, max_points - 1).astype(np.int64)
+
+    picked = np.empty(max_points, dtype=np.int64)
+    picked[0] = anchor = 0
+    for bucket in range(max_points - 2):
+        low, high = edges[bucket], edges[bucket + 1]
+        next_low, next_high = (high, edges[bucket + 2]) if bucket + 2 < len(edges) else (length - 1, length)
+        avg_x = x[next_low:next_high].mean()
+        avg_y = y[next_low:next_high].mean()
+        area = np.abs((x[anchor] - avg_x) * (y[low:high] - y[anchor]) - (x[anchor] - x[low:high]) * (avg_y - y[anchor]))
+        anchor = low + int(np.argmax(area))
+        picked[bucket + 1] = anchor
+    picked[-1] = length - 1
+    return picked
+
+
+def downsample(frame: pd.DataFrame, max_points: int, method: str = "ohlc", overlays: Sequence[str] = ()) -> pd.DataFrame:
+    if method == "lttb":
+        return frame.iloc[lttb_indices(frame["Close"].to_numpy(dtype=np.float64), max_points)]
+    if method == "ohlc":
+        return ohlc_buckets(frame, max_points, overlays)
+    raise ValueError(f"Unknown downsampling method: {method}")
@@ -1,15 +1,26 @@
 from __future__ import annotations
 
-import concurrent.futures
+import asyncio
+import collections
+import contextlib
 import math
-from typing import Any
+import threading
+import time
+from typing import Any, AsyncIterator, Callable, Hashable
 
 import numpy as np
 import pandas as pd
 import pytz
 
-from .config import SAMPLE_DATA_DIR
-from .indicators import add_atr, add_rsi, add_sma, pct, vwap
+from .cache import BARS, FEATURES, LIQUIDITY, CacheBackend, NullCache, cache_ttl
+from .config import config_fingerprint
+from .delta import DeltaState, bar_fingerprint
+from .expressions import compile_rules, evaluate_rules
+from .indicators import pct, vwap
+from .ingest import CompactBars, compact_payload, stored_price
+from .liquidity import LiquidityEstimates
+from .panel import BarPanel
+from .providers import BarSource, get_source, open_http_client
 from .rules import (
     bearish_engulfing,
     bullish_engulfing,
@@ -29,10 +40,56 @@ from .rules import (
     volume_confirm,
     vwap_reclaim_premarket,
 )
+from .singleflight import AsyncSingleFlight
+from .timeframes import TIMEFRAMES, TimeframeCache, configured_timeframes
 
 ET = pytz.timezone("America/New_York")
 
 
+class RecentBars:
+    """The compact bars each ticker was last scored from, most recent ``limit`` kept."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._entries: collections.OrderedDict[Hashable, dict[str, Any]] = collections.OrderedDict()
+
+    def get(self, key: Hashable) -> dict[str, Any] | None:
+        with self._lock:
+            return self._entries.get(key)
+
+    def put(self, key: Hashable, bars: dict[str, Any], limit: int) -> None:
+        with self._lock:
+            self._entries[key] = bars
+            self._entries.move_to_end(key)
+            while len(self._entries) > max(limit, 0):
+                self._entries.popitem(last=False)
+
+
+# Shared by every DataProvider so overlapping scans fetch each ticker once.
+_ASYNC_FETCH_FLIGHTS = AsyncSingleFlight()
+# Higher-timeframe candles, kept across scans so each one only aggregates new bars.
+_TIMEFRAME_CACHE = TimeframeCache()
+# Dollar volume seen in earlier scans; decides which tickers are fetched first.
+_LIQUIDITY = LiquidityEstimates()
+_RECENT_BARS = RecentBars()
+
+# Candle rules that scoring.timeframes can apply to 5m/15m premarket or weekly candles.
+TIMEFRAME_RULES: dict[str, Any] = {
+    "hammer": hammer,
+    "inverted_hammer": inverted_hammer,
+    "bullish_engulfing": bullish_engulfing,
+    "morning_star": morning_star,
+    "harami_bull": harami_bull,
+    "three_white_soldiers": three_white_soldiers,
+    "shooting_star": shooting_star,
+    "bearish_engulfing": bearish_engulfing,
+    "evening_star": evening_star,
+    "harami_bear": harami_bear,
+    "three_black_crows": three_black_crows,
+    "uptrend_hh_hl": lambda df: (higher_highs_lows(df, lookback=12), "HH/HL uptrend"),
+}
+
+
 def slice_premarket(df: pd.DataFrame, start: str = "04:00", end: str = "09:29") -> pd.DataFrame:
     if df is None or df.empty:
         return df
@@ -59,80 +116,130 @@ def _last_numeric_value(series: pd.Series | None) -> float:
 
 
 class DataProvider:
-    def __init__(self, cfg: dict[str, Any], mode: str = "live") -> None:
+    def __init__(
+        self,
+        cfg: dict[str, Any],
+        mode: str = "live",
+        cache: CacheBackend | None = None,
+        source: BarSource | None = None,
+    ) -> None:
         self.cfg = cfg
         self.mode = mode
+        self.cfg_key = config_fingerprint(cfg)
+        self.cache = cache or NullCache()
+        self.source = source or get_source(mode, cfg)
+
+    def _features_key(self, ticker: str) -> str:
+        return f"{self.source.key}:{ticker}:{self.cfg_key}"
+
+    def recent_package(self, ticker: str) -> dict[str, Any] | None:
+        """The package this process last scored ``ticker`` from, rebuilt from its bars."""
+        bars = _RECENT_BARS.get(self._features_key(ticker))
+        return None if bars is None else self.build_packages([bars], cached=False)[0]
+
+    def remember(self, bars: dict[str, Any], pkg: dict[str, Any]) -> None:
+        limit = int((self.cfg.get("fetch") or {}).get("recent_bars", 256))
+        if limit > 0 and _is_cacheable(pkg):
+            _RECENT_BARS.put(self._features_key(pkg["ticker"]), bars, limit)
+
+    async def fetch_async(self, ticker: str, client: Any | None = None) -> dict[str, Any]:
+        return await _ASYNC_FETCH_FLIGHTS.do((self.source.key, ticker, self.cfg_key), self._fetch_async_uncoalesced, ticker, client)
+
+    async def _fetch_async_uncoalesced(self, ticker: str, client: Any | None) -> dict[str, Any]:
+        async def compute() -> dict[str, Any]:
+            return self.build_packages([await self.fetch_bars_async(ticker, client)], cached=False)[0]
+
+        return await self.cache.get_or_set_async(
+            FEATURES,
+            self._features_key(ticker),
+            compute,
+            ttl=cache_ttl(self.cfg, FEATURES),
+            store_if=_is_cacheable,
+        )
 
-    def fetch(self, ticker: str) -> dict[str, Any]:
-        if self.mode == "sample":
-            return self._fetch_sample(ticker)
-        return self._fetch_live(ticker)
-
-    def _fetch_live(self, ticker: str) -> dict[str, Any]:
-        try:
-            import yfinance as yf
-        except Exception:
-            return {"ticker": ticker, "error": "yfinance not installed"}
+    async def fetch_bars_async(self, ticker: str, client: Any | None = None) -> dict[str, Any]:
+        return await _ASYNC_FETCH_FLIGHTS.do(("bars", self.source.key, ticker), self._fetch_bars_async_uncoalesced, ticker, client)
 
-        try:
-            daily = yf.download(ticker, period="300d", interval="1d", auto_adjust=False, prepost=False, progress=False, threads=False)
-            if daily is None or daily.empty:
-                return {"ticker": ticker, "error": "no daily"}
-
-            for period in self.cfg["indicators"].get("ma_periods", [20, 50, 200]):
-                daily = add_sma(daily, period)
-            daily = add_rsi(daily, self.cfg["indicators"].get("rsi_period", 14))
-            daily = add_atr(daily, self.cfg["indicators"].get("atr_period", 14))
-
-            intra = yf.download(ticker, period="1d", interval="1m", auto_adjust=False, prepost=True, progress=False, threads=False)
-            pre = slice_premarket(intra, self.cfg["premarket_window"]["start"], self.cfg["premarket_window"]["end"])
-            if pre is not None and not pre.empty:
-                pre = pre.copy()
-                pre["VWAP"] = vwap(pre)
+    async def _fetch_bars_async_uncoalesced(self, ticker: str, client: Any | None) -> dict[str, Any]:
+        async def compute() -> dict[str, Any]:
+            return compact_payload(await self.source.load_async(ticker, client))
 
-            return self._package_payload(ticker, daily, pre)
-        except Exception as exc:
-            return {"ticker": ticker, "error": str(exc)}
-
-    def _fetch_sample(self, ticker: str) -> dict[str, Any]:
-        daily_path = SAMPLE_DATA_DIR / f"{ticker}_daily.csv"
-        if not daily_path.exists():
-            return {"ticker": ticker, "error": "no sample data"}
+        return await self.cache.get_or_set_async(
+            BARS,
+            f"{self.source.key}:{ticker}",
+            compute,
+            ttl=cache_ttl(self.cfg, BARS),
+            store_if=_is_cacheable,
+        )
 
-        daily = self._read_sample_csv(daily_path, "Date")
-        for period in self.cfg["indicators"].get("ma_periods", [20, 50, 200]):
-            daily = add_sma(daily, period)
-        daily = add_rsi(daily, self.cfg["indicators"].get("rsi_period", 14))
-        daily = add_atr(daily, self.cfg["indicators"].get("atr_period", 14))
+    def build_packages(self, bars: list[dict[str, Any]], cached: bool = True) -> list[dict[str, Any]]:
+        """Turn fetched bars into scoring packages, one panel pass for all daily indicators."""
+        packages = list(bars)
+        pending: list[int] = []
+        for position, item in enumerate(bars):
+            if "error" in item:
+                continue
+            hit = self.cache.get(FEATURES, self._features_key(item["ticker"])) if cached else None
+            if hit is not None:
+                packages[position] = hit
+            else:
+                pending.append(position)
+        if not pending:
+            return packages
 
-        intraday_path = SAMPLE_DATA_DIR / f"{ticker}_intraday.csv"
+        try:
+            panel = BarPanel.from_bars([bars[position] for position in pending]).compute(self.cfg["indicators"])
+        except Exception as exc:
+            for position in pending:
+                packages[position] = {"ticker": bars[position]["ticker"], "error": str(exc)}
+            return packages
+
+        for column, position in enumerate(pending):
+            item = bars[position]
+            try:
+                packages[position] = self._package_payload(item["ticker"], panel.frame(column), self._premarket(item.get("intra")))
+            except Exception as exc:
+                packages[position] = {"ticker": item["ticker"], "error": str(exc)}
+
+        timeframes = configured_timeframes(self.cfg)
+        rule_hits = evaluate_rules(compile_rules(self.cfg), panel, [packages[position].get("metrics", {}) for position in pending])
+        for column, position in enumerate(pending):
+            pkg = packages[position]
+            if not _is_cacheable(pkg):
+                continue
+            pkg["rule_hits"] = rule_hits[column]
+            if timeframes:
+                pkg["timeframes"] = self._timeframe_frames(bars[position], timeframes)
+            if cached:
+                self.cache.set(FEATURES, self._features_key(pkg["ticker"]), pkg, ttl=cache_ttl(self.cfg, FEATURES))
+        return packages
+
+    def _timeframe_frames(self, bars: dict[str, Any], timeframes: dict[str, Any]) -> dict[str, pd.DataFrame]:
+        frames: dict[str, pd.DataFrame] = {}
+        for timeframe in timeframes:
+            base_name, _ = TIMEFRAMES[timeframe]
+            base = bars.get(base_name)
+            if base is None or base.empty:
+                frames[timeframe] = pd.DataFrame()
+                continue
+            frame = _TIMEFRAME_CACHE.get((self.source.key, bars["ticker"], timeframe), base, timeframe).to_frame()
+            if base_name == "intra":
+                window = self.cfg["premarket_window"]
+                frame = slice_premarket(frame, window["start"], window["end"])
+            frames[timeframe] = frame
+        return frames
+
+    def _premarket(self, intra: CompactBars | None) -> pd.DataFrame:
         pre = pd.DataFrame()
-        if intraday_path.exists():
-            intra = self._read_sample_csv(intraday_path, "Datetime")
-            if getattr(intra["Datetime"].dt, "tz", None) is None:
-                intra["Datetime"] = intra["Datetime"].dt.tz_localize("America/New_York")
-            else:
-                intra["Datetime"] = intra["Datetime"].dt.tz_convert("America/New_York")
-            intra = intra.set_index("Datetime")
-            pre = slice_premarket(intra, self.cfg["premarket_window"]["start"], self.cfg["premarket_window"]["end"]).copy()
+        if intra is not None and not intra.empty:
+            pre = slice_premarket(intra.to_frame(), self.cfg["premarket_window"]["start"], self.cfg["premarket_window"]["end"]).copy()
             if not pre.empty:
                 pre["VWAP"] = vwap(pre)
-
-        return self._package_payload(ticker, daily, pre)
-
-    @staticmethod
-    def _read_sample_csv(path, date_column: str) -> pd.DataFrame:
-        frame = pd.read_csv(path, skiprows=[1] if _has_ticker_header(path) else None)
-        frame[date_column] = pd.to_datetime(frame[date_column], errors="coerce")
-        frame = frame.dropna(subset=[date_column]).copy()
-        numeric_columns = [column for column in frame.columns if column != date_column]
-        for column in numeric_columns:
-            frame[column] = pd.to_numeric(frame[column], errors="coerce")
-        return frame
+        return pre
 
     def _package_payload(self, ticker: str, daily: pd.DataFrame, pre: pd.DataFrame) -> dict[str, Any]:
-        prev_close = _last_numeric_value(daily["Close"] if "Close" in daily else None)
-        pre_last = _last_numeric_value(pre["Close"] if pre is not None and "Close" in pre else None)
+        prev_close = stored_price(_last_numeric_value(daily["Close"] if "Close" in daily else None))
+        pre_last = stored_price(_last_numeric_value(pre["Close"] if pre is not None and "Close" in pre else None))
         gap_pct = pct(pre_last, prev_close) if not math.isnan(prev_close) and not math.isnan(pre_last) else np.nan
 
         avg20_vol = float(daily["Volume"].tail(20).mean()) if "Volume" in daily else np.nan
@@ -157,11 +264,8 @@ class DataProvider:
         }
 
 
-def _has_ticker_header(path) -> bool:
-    with open(path, "r", encoding="utf-8") as handle:
-        handle.readline()
-        second = handle.readline()
-    return second.startswith(",")
+def _is_cacheable(payload: dict[str, Any]) -> bool:
+    return "error" not in payload
 
 
 def apply_filters(pkg: dict[str, Any], cfg: dict[str, Any]) -> tuple[bool, str]:
@@ -235,54 +339,296 @@ def score(pkg: dict[str, Any], cfg: dict[str, Any]) -> tuple[int, list[str]]:
         total += int(weights.get("volume_confirm", 0))
         reasons.append(f"Rel $Vol {metrics['rel_dollar_vol']:.2f}x")
 
+    labels = {rule.name: rule.label for rule in compile_rules(cfg)}
+    for name in pkg.get("rule_hits", []):
+        total += int(weights.get(name, 0))
+        reasons.append(labels.get(name, name))
+
+    frames = pkg.get("timeframes") or {}
+    for timeframe, key, fn, weight in timeframe_rules(cfg):
+        frame = frames.get(timeframe)
+        if frame is None or frame.empty:
+            continue
+        ok, name = fn(frame)
+        if ok:
+            total += int(weight)
+            reasons.append(f"{name} ({timeframe})")
+
     return total, reasons
 
 
-def run_scan(tickers: list[str], cfg: dict[str, Any], mode: str = "live") -> pd.DataFrame:
-    provider = DataProvider(cfg, mode=mode)
-    packages: list[dict[str, Any]] = []
-    with concurrent.futures.ThreadPoolExecutor(max_workers=16) as executor:
-        futures = {executor.submit(provider.fetch, ticker): ticker for ticker in tickers}
-        for future in concurrent.futures.as_completed(futures):
-            packages.append(future.result())
+def timeframe_rules(cfg: dict[str, Any]) -> list[tuple[str, str, Any, float]]:
+    """``(timeframe, rule key, rule, weight)`` for every entry in ``scoring.timeframes``."""
+    rules = []
+    for timeframe, weights in configured_timeframes(cfg).items():
+        for key, weight in weights.items():
+            if key not in TIMEFRAME_RULES:
+                raise ValueError(f"Unknown rule '{key}' in scoring.timeframes.{timeframe}")
+            rules.append((timeframe, key, TIMEFRAME_RULES[key], weight))
+    return rules
+
+
+RESULT_COLUMNS = ["ticker", "score", "gap_pct", "rel_dollar_vol", "avg20_dollar_vol", "price", "premarket_last", "reasons"]
 
-    rows: list[dict[str, Any]] = []
-    low_rows: list[dict[str, Any]] = []
+
+def evaluate(pkg: dict[str, Any], cfg: dict[str, Any]) -> dict[str, Any] | None:
+    ok, _ = apply_filters(pkg, cfg)
+    if not ok:
+        return None
+    total, reasons = score(pkg, cfg)
+    metrics = pkg["metrics"]
+    return {
+        "ticker": pkg["ticker"],
+        "score": int(total),
+        "gap_pct": metrics.get("gap_pct", np.nan),
+        "rel_dollar_vol": metrics.get("rel_dollar_vol", np.nan),
+        "avg20_dollar_vol": metrics.get("avg20_dollar_vol", np.nan),
+        "price": metrics.get("price", np.nan),
+        "premarket_last": metrics.get("premarket_last", np.nan),
+        "reasons": reasons,
+    }
+
+
+def _rank_key(row: dict[str, Any]) -> tuple[Any, ...]:
+    # score, rel $vol and gap descending with NaN last, then ticker, which
+    # makes the order total and independent of fetch completion order.
+    rel = row["rel_dollar_vol"]
+    gap = row["gap_pct"]
+    rel_missing = bool(pd.isna(rel))
+    gap_missing = bool(pd.isna(gap))
+    return (
+        -row["score"],
+        rel_missing,
+        0.0 if rel_missing else -float(rel),
+        gap_missing,
+        0.0 if gap_missing else -float(gap),
+        row["ticker"],
+    )
+
+
+def select_candidates(scored: list[dict[str, Any]], cfg: dict[str, Any]) -> list[dict[str, Any]]:
+    """Rows that can still reach the final ranking; the same for any partition, so shards can trim early."""
     include_low = bool(cfg["scoring"].get("include_low_signal", True))
     low_cap = int(cfg["scoring"].get("low_signal_limit", 30))
+    top_n = int(cfg["scoring"].get("top_n", 100))
 
-    for pkg in packages:
-        ok, _ = apply_filters(pkg, cfg)
-        if not ok:
-            continue
-        total, reasons = score(pkg, cfg)
-        metrics = pkg["metrics"]
-        row = {
-            "ticker": pkg["ticker"],
-            "score": int(total),
-            "gap_pct": metrics.get("gap_pct", np.nan),
-            "rel_dollar_vol": metrics.get("rel_dollar_vol", np.nan),
-            "avg20_dollar_vol": metrics.get("avg20_dollar_vol", np.nan),
-            "price": metrics.get("price", np.nan),
-            "premarket_last": metrics.get("premarket_last", np.nan),
-            "reasons": reasons,
-        }
-        if total > 0:
-            rows.append(row)
-        elif include_low:
-            low_rows.append(row)
+    scored = sorted(scored, key=lambda row: row["ticker"])
+    rows = sorted((row for row in scored if row["score"] > 0), key=_rank_key)[:top_n]
+    low_rows = [row for row in scored if row["score"] <= 0] if include_low else []
 
     low_rows = sorted(
         low_rows,
         key=lambda row: row["rel_dollar_vol"] if pd.notna(row["rel_dollar_vol"]) else -1,
         reverse=True,
     )[:low_cap]
-    rows.extend(low_rows)
+    return rows + low_rows
+
 
-    columns = ["ticker", "score", "gap_pct", "rel_dollar_vol", "avg20_dollar_vol", "price", "premarket_last", "reasons"]
+def rank_rows(scored: list[dict[str, Any]], cfg: dict[str, Any]) -> pd.DataFrame:
+    rows = select_candidates(scored, cfg)
     if not rows:
-        return pd.DataFrame(columns=columns)
+        return pd.DataFrame(columns=RESULT_COLUMNS)
 
-    result = pd.DataFrame(rows).sort_values(["score", "rel_dollar_vol", "gap_pct"], ascending=[False, False, False])
     top_n = int(cfg["scoring"].get("top_n", 100))
-    return result.head(top_n).reset_index(drop=True)
+    return pd.DataFrame(sorted(rows, key=_rank_key)[:top_n], columns=RESULT_COLUMNS)
+
+
+@contextlib.asynccontextmanager
+async def http_client(cfg: dict[str, Any], source: BarSource, client: Any | None = None) -> AsyncIterator[Any | None]:
+    """Yield ``client``, or a pooled client scoped to this block if the source needs one."""
+    if client is not None or not source.uses_http:
+        yield client
+        return
+    owned = open_http_client(cfg)
+    try:
+        yield owned
+    finally:
+        if owned is not None:
+            await owned.aclose()
+
+
+def _score_fetched(
+    provider: DataProvider,
+    fetched: list[dict[str, Any]],
+    delta: DeltaState | None,
+) -> tuple[list[dict[str, Any]], int]:
+    scored: list[dict[str, Any]] = []
+    reused = 0
+    pending: list[tuple[dict[str, Any], str | None]] = []
+    for bars in fetched:
+        fingerprint = bar_fingerprint(bars, provider.cfg_key) if delta is not None else None
+        if delta is not None:
+            hit, row = delta.lookup(bars["ticker"], fingerprint)
+            if hit:
+                reused += 1
+                if row is not None:
+                    scored.append(row)
+                    _LIQUIDITY.update([(row["ticker"], row["avg20_dollar_vol"])])
+                continue
+        pending.append((bars, fingerprint))
+
+    # Delta scans already decided these inputs changed, so skip the features cache.
+    packages = provider.build_packages([bars for bars, _ in pending], cached=delta is None)
+    _LIQUIDITY.update((pkg["ticker"], pkg["metrics"].get("avg20_dollar_vol")) for pkg in packages if "metrics" in pkg)
+    for (bars, fingerprint), pkg in zip(pending, packages):
+        provider.remember(bars, pkg)
+        row = evaluate(pkg, provider.cfg)
+        if delta is not None:
+            delta.store(bars["ticker"], fingerprint, row)
+        if row is not None:
+            scored.append(row)
+    return scored, reused
+
+
+async def score_tickers_async(
+    tickers: list[str],
+    cfg: dict[str, Any],
+    mode: str = "live",
+    cache: CacheBackend | None = None,
+    source: BarSource | None = None,
+    delta: DeltaState | None = None,
+    client: Any | None = None,
+    on_rows: Callable[[list[dict[str, Any]], int], None] | None = None,
+    deadline_ms: int | None = None,
+) -> tuple[list[dict[str, Any]], int, dict[str, list[str]]]:
+    """Fetch ``tickers`` concurrently and score them; also returns the reused count and unfinished tickers."""
+    # Counted from here. Scoring is capped at the deadline, so only the ranking
+    # and the liquidity save run past it; tickers not scored by then are
+    # reported as timed_out (fetch started) or pending (never started).
+    deadline = None if deadline_ms is None else time.monotonic() + deadline_ms / 1000.0
+    provider = DataProvider(cfg, mode=mode, cache=cache, source=source)
+    settings = cfg.get("fetch") or {}
+    limit = asyncio.Semaphore(max(1, int(settings.get("concurrency", 16))))
+    ordered = await asyncio.to_thread(_LIQUIDITY.order, tickers, provider.cache)
+    started: set[str] = set()
+
+    async with http_client(cfg, provider.source, client) as pooled:
+
+        async def fetch(ticker: str) -> dict[str, Any]:
+            async with limit:
+                started.add(ticker)
+                return await provider.fetch_bars_async(ticker, pooled)
+
+        if on_rows is None and deadline_ms is None:
+            fetched = await asyncio.gather(*(fetch(ticker) for ticker in ordered))
+            scored, reused = await asyncio.to_thread(_score_fetched, provider, list(fetched), delta)
+            finished = set(ordered)
+        else:
+            scored, reused, finished = await _score_as_completed(
+                provider,
+                [fetch(ticker) for ticker in ordered],
+                delta,
+                int(settings.get("stream_batch", 25)),
+                on_rows,
+                deadline,
+            )
+
+    await asyncio.to_thread(_LIQUIDITY.save, provider.cache, cache_ttl(cfg, LIQUIDITY))
+    unfinished = [ticker for ticker in ordered if ticker not in finished]
+    return scored, reused, {
+        "timed_out": [ticker for ticker in unfinished if ticker in started],
+        "pending": [ticker for ticker in unfinished if ticker not in started],
+    }
+
+
+async def _score_as_completed(
+    provider: DataProvider,
+    fetches: list[Any],
+    delta: DeltaState | None,
+    batch_size: int,
+    on_rows: Callable[[list[dict[str, Any]], int], None] | None = None,
+    deadline: float | None = None,
+) -> tuple[list[dict[str, Any]], int, set[str]]:
+    tasks = [asyncio.ensure_future(fetch) for fetch in fetches]
+    scored: list[dict[str, Any]] = []
+    reused = 0
+    batch: list[dict[str, Any]] = []
+    finished: set[str] = set()
+    done = 0
+
+    def remaining() -> float | None:
+        return None if deadline is None else deadline - time.monotonic()
+
+    async def flush() -> bool:
+        nonlocal batch, reused
+        try:
+            # A batch that cannot be scored by the deadline is dropped; its
+            # thread runs on, but the scan no longer waits for it.
+            rows, hits = await asyncio.wait_for(asyncio.to_thread(_score_fetched, provider, batch, delta), remaining())
+        except TimeoutError:
+            return False
+        scored.extend(rows)
+        reused += hits
+        finished.update(bars["ticker"] for bars in batch)
+        batch = []
+        if on_rows is not None:
+            on_rows(rows, done)
+        return True
+
+    try:
+        outstanding = set(tasks)
+        while outstanding:
+            timeout = remaining()
+            if timeout is not None and timeout <= 0:
+                break
+            completed, outstanding = await asyncio.wait(outstanding, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+            for task in completed:
+                batch.append(task.result())
+                done += 1
+            # Against a deadline, score whatever arrived while the last batch
+            # was scored instead of waiting for a full one.
+            full = len(batch) >= max(1, batch_size) or deadline is not None
+            if batch and (full or not outstanding) and not await flush():
+                break
+    finally:
+        # A cancelled or timed-out scan must not leave fetches running on the
+        # loop. Coalesced fetches are shielded and still finish into the cache.
+        for task in tasks:
+            task.cancel()
+    return scored, reused, finished
+
+
+def score_tickers(
+    tickers: list[str],
+    cfg: dict[str, Any],
+    mode: str = "live",
+    cache: CacheBackend | None = None,
+    source: BarSource | None = None,
+    delta: DeltaState | None = None,
+    deadline_ms: int | None = None,
+) -> tuple[list[dict[str, Any]], int, dict[str, list[str]]]:
+    return asyncio.run(score_tickers_async(tickers, cfg, mode=mode, cache=cache, source=source, delta=delta, deadline_ms=deadline_ms))
+
+
+async def run_scan_async(
+    tickers: list[str],
+    cfg: dict[str, Any],
+    mode: str = "live",
+    cache: CacheBackend | None = None,
+    source: BarSource | None = None,
+    delta: DeltaState | None = None,
+    client: Any | None = None,
+    on_rows: Callable[[list[dict[str, Any]], int], None] | None = None,
+    deadline_ms: int | None = None,
+) -> pd.DataFrame:
+    """Fetch, score and rank ``tickers``; ``result.attrs`` holds ``reused``, ``timed_out`` and ``pending``."""
+    scored, reused, unfinished = await score_tickers_async(
+        tickers, cfg, mode=mode, cache=cache, source=source, delta=delta, client=client, on_rows=on_rows, deadline_ms=deadline_ms
+    )
+    result = rank_rows(scored, cfg)
+    result.attrs["reused"] = reused
+    result.attrs.update(unfinished)
+    return result
+
+
+def run_scan(
+    tickers: list[str],
+    cfg: dict[str, Any],
+    mode: str = "live",
+    cache: CacheBackend | None = None,
+    source: BarSource | None = None,
+    delta: DeltaState | None = None,
+    deadline_ms: int | None = None,
+) -> pd.DataFrame:
+    """Blocking ``run_scan_async`` for scripts and threads without a running loop."""
+    return asyncio.run(run_scan_async(tickers, cfg, mode=mode, cache=cache, source=source, delta=delta, deadline_ms=deadline_ms))
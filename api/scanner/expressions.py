@@ -0,0 +1,219 @@
+from __future__ import annotations
+
+import ast
+import functools
+import operator
+from typing import Any, Callable
+
+import numpy as np
+
+from .panel import PANEL_FIELDS, BarPanel, indicator_columns
+
+METRIC_NAMES = ["gap_pct", "rel_dollar_vol", "avg20_dollar_vol", "price", "premarket_last"]
+
+# scoring.weights keys the built-in scorer already reads; a rule reusing one
+# would have its weight counted twice.
+BUILTIN_WEIGHTS = frozenset(
+    [
+        "hammer",
+        "inverted_hammer",
+        "bullish_engulfing",
+        "morning_star",
+        "harami_bull",
+        "three_white_soldiers",
+        "shooting_star",
+        "bearish_engulfing",
+        "evening_star",
+        "harami_bear",
+        "three_black_crows",
+        "uptrend_ma_stack",
+        "uptrend_hh_hl",
+        "vwap_reclaim_pre",
+        "gap_up",
+        "volume_confirm",
+    ]
+)
+
+_BINARY_OPS: dict[type, Callable[[Any, Any], Any]] = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+}
+_COMPARE_OPS: dict[type, Callable[[Any, Any], Any]] = {
+    ast.Lt: operator.lt,
+    ast.LtE: operator.le,
+    ast.Gt: operator.gt,
+    ast.GtE: operator.ge,
+    ast.Eq: operator.eq,
+    ast.NotEq: operator.ne,
+}
+_FUNCTIONS: dict[str, Callable[..., Any]] = {
+    "abs": np.abs,
+    "min": np.fmin,
+    "max": np.fmax,
+}
+
+Evaluator = Callable[["RuleContext"], Any]
+
+
+class RuleError(ValueError):
+    pass
+
+
+class RuleContext:
+    """Values a compiled rule can read, one array element per ticker."""
+
+    def __init__(self, panel: BarPanel, metrics: list[dict[str, Any]]) -> None:
+        self.panel = panel
+        self.depth = panel.depth
+        self.columns = {field.lower(): values for field, values in panel.fields.items()}
+        self.columns.update({name.lower(): values for name, values in panel.indicators.items()})
+        self.metrics = {name: np.array([item.get(name, np.nan) for item in metrics], dtype=np.float64) for name in METRIC_NAMES}
+
+    def value(self, name: str, lag: int) -> np.ndarray:
+        if name in self.metrics:
+            return self.metrics[name]
+        values = self.columns[name]
+        if lag >= self.depth:
+            return np.full(values.shape[1], np.nan)
+        return values[self.depth - 1 - lag]
+
+
+def _resolve_name(name: str, indicators: frozenset[str], source: str) -> str:
+    """The lowercase name ``RuleContext`` stores ``name`` under; names are case-insensitive."""
+    key = name.lower()
+    if key in METRIC_NAMES or key in {field.lower() for field in PANEL_FIELDS} or key in indicators:
+        return key
+    prefix = key.rstrip("0123456789")
+    if prefix in {"sma", "rsi", "atr"} and prefix != key:
+        configured = ", ".join(sorted(indicators))
+        raise RuleError(f"Indicator '{name}' is not computed by the indicators section ({configured}) in rule: {source}")
+    raise RuleError(f"Unknown name '{name}' in rule: {source}")
+
+
+def _compile_node(node: ast.AST, source: str, indicators: frozenset[str]) -> Evaluator:
+    if isinstance(node, ast.Expression):
+        return _compile_node(node.body, source, indicators)
+
+    if isinstance(node, ast.Constant) and isinstance(node.value, (int, float, bool)):
+        constant = node.value
+        return lambda context: constant
+
+    if isinstance(node, ast.Name):
+        name = _resolve_name(node.id, indicators, source)
+        return lambda context: context.value(name, 0)
+
+    if isinstance(node, ast.Subscript) and isinstance(node.value, ast.Name):
+        name = _resolve_name(node.value.id, indicators, source)
+        lag = node.slice
+        if name in METRIC_NAMES:
+            raise RuleError(f"Only bar fields and indicators take a lookback, got '{node.value.id}' in rule: {source}")
+        if not (isinstance(lag, ast.Constant) and isinstance(lag.value, int) and lag.value >= 0):
+            raise RuleError(f"Lookback must be a non-negative integer in rule: {source}")
+        bars_ago = int(lag.value)
+        return lambda context: context.value(name, bars_ago)
+
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.USub, ast.Not)):
+        operand = _compile_node(node.operand, source, indicators)
+        if isinstance(node.op, ast.USub):
+            return lambda context: -operand(context)
+        return lambda context: ~_truthy(operand(context))
+
+    if isinstance(node, ast.BinOp) and type(node.op) in _BINARY_OPS:
+        op = _BINARY_OPS[type(node.op)]
+        left = _compile_node(node.left, source, indicators)
+        right = _compile_node(node.right, source, indicators)
+
+        def binary(context: RuleContext) -> Any:
+            with np.errstate(divide="ignore", invalid="ignore"):
+                return op(left(context), right(context))
+
+        return binary
+
+    if isinstance(node, ast.BoolOp):
+        parts = [_compile_node(value, source, indicators) for value in node.values]
+        reducer = np.logical_and if isinstance(node.op, ast.And) else np.logical_or
+        return lambda context: functools.reduce(reducer, (_truthy(part(context)) for part in parts))
+
+    if isinstance(node, ast.Compare) and all(type(op) in _COMPARE_OPS for op in node.ops):
+        operands = [_compile_node(node.left, source, indicators)] + [_compile_node(value, source, indicators) for value in node.comparators]
+        ops = [_COMPARE_OPS[type(op)] for op in node.ops]
+
+        def compare(context: RuleContext) -> Any:
+            values = [operand(context) for operand in operands]
+            result = True
+            for position, op in enumerate(ops):
+                result = np.logical_and(result, op(values[position], values[position + 1]))
+            return result
+
+        return compare
+
+    if isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and node.func.id in _FUNCTIONS and not node.keywords:
+        function = _FUNCTIONS[node.func.id]
+        args = [_compile_node(arg, source, indicators) for arg in node.args]
+        if len(args) != (1 if node.func.id == "abs" else 2):
+            raise RuleError(f"Wrong number of arguments to {node.func.id}() in rule: {source}")
+        return lambda context: function(*(arg(context) for arg in args))
+
+    raise RuleError(f"Unsupported syntax '{ast.dump(node)[:40]}' in rule: {source}")
+
+
+def _truthy(value: Any) -> np.ndarray:
+    array = np.asarray(value)
+    if array.dtype == bool:
+        return array
+    return np.nan_to_num(array.astype(np.float64), nan=0.0) != 0
+
+
+class CompiledRule:
+    def __init__(self, name: str, label: str, source: str, evaluator: Evaluator) -> None:
+        self.name = name
+        self.label = label
+        self.source = source
+        self.evaluator = evaluator
+
+    def evaluate(self, context: RuleContext) -> np.ndarray:
+        result = _truthy(self.evaluator(context))
+        return np.broadcast_to(result, (len(context.panel.tickers),))
+
+
+def compile_rule(name: str, source: str, label: str | None = None, indicators: frozenset[str] = frozenset()) -> CompiledRule:
+    try:
+        tree = ast.parse(source, mode="eval")
+    except SyntaxError as exc:
+        raise RuleError(f"Invalid rule '{name}': {exc.msg}") from exc
+    return CompiledRule(name, label or name, source, _compile_node(tree, source, indicators))
+
+
+@functools.lru_cache(maxsize=32)
+def _compile_spec(spec: tuple[tuple[str, str, str], ...], indicators: frozenset[str]) -> tuple[CompiledRule, ...]:
+    return tuple(compile_rule(name, source, label, indicators) for name, source, label in spec)
+
+
+def compile_rules(cfg: dict[str, Any]) -> tuple[CompiledRule, ...]:
+    """Compile and validate the ``rules`` section of the config; memoised on the rule text."""
+    weights = (cfg.get("scoring") or {}).get("weights") or {}
+    spec = []
+    for entry in cfg.get("rules") or []:
+        if "name" not in entry or "when" not in entry:
+            raise RuleError(f"Rule entries need 'name' and 'when': {entry}")
+        if str(entry["name"]) in BUILTIN_WEIGHTS:
+            raise RuleError(f"Rule '{entry['name']}' reuses a built-in scoring.weights key, so its weight would count twice")
+        if str(entry["name"]) not in weights:
+            raise RuleError(f"Rule '{entry['name']}' has no scoring.weights entry, so it could never score")
+        spec.append((str(entry["name"]), str(entry["when"]), str(entry.get("label") or entry["name"])))
+    indicators = frozenset(name.lower() for name in indicator_columns(cfg.get("indicators") or {}))
+    return _compile_spec(tuple(spec), indicators)
+
+
+def evaluate_rules(rules: tuple[CompiledRule, ...], panel: BarPanel, metrics: list[dict[str, Any]]) -> list[list[str]]:
+    """Names of the rules each panel ticker matched, one pass per rule over all tickers."""
+    hits: list[list[str]] = [[] for _ in panel.tickers]
+    if not rules or not panel.tickers:
+        return hits
+    context = RuleContext(panel, metrics)
+    for rule in rules:
+        for position in np.flatnonzero(rule.evaluate(context)):
+            hits[position].append(rule.name)
+    return hits
@@ -0,0 +1,243 @@
+from __future__ import annotations
+
+import io
+import json
+import threading
+import time
+from datetime import date, datetime, timezone
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pytz
+
+from .cache import atomic_write, file_lock
+from .config import ROOT_DIR
+
+ET = pytz.timezone("America/New_York")
+
+# Layout: segments/<day>/<scan_id>.npz holds one scan's rows as columns,
+# catalog.jsonl one line per scan (its line number is the scan's seq) and
+# tickers.idx one fixed-width record per stored row, appended in scan order.
+_INDEX_DTYPE = np.dtype([("ticker", "S16"), ("ts", "<i8"), ("seq", "<i4"), ("row", "<i4")])
+_FLOAT_COLUMNS = ["gap_pct", "rel_dollar_vol", "avg20_dollar_vol", "price", "premarket_last"]
+
+
+def trading_day(ts_ns: int) -> str:
+    return datetime.fromtimestamp(ts_ns / 1e9, tz=timezone.utc).astimezone(ET).date().isoformat()
+
+
+class HistoryStore:
+    """Append-only scan history: a columnar segment per scan, a scan catalog and a (ticker, timestamp) index."""
+
+    CATALOG = "catalog.jsonl"
+    INDEX = "tickers.idx"
+
+    def __init__(self, root: str | Path) -> None:
+        path = Path(root)
+        self.root = path if path.is_absolute() else ROOT_DIR / path
+        self._lock = threading.Lock()
+        self._catalog: list[dict[str, Any]] = []
+        self._catalog_offset = 0
+        self._by_scan: dict[str, int] = {}
+        self._index = np.empty(0, dtype=_INDEX_DTYPE)
+        self._index_offset = 0
+        self._order: np.ndarray | None = None
+
+    def append(self, scan_id: str, rows: list[dict[str, Any]], universe: str, mode: str, ts_ns: int | None = None) -> None:
+        ts_ns = int(ts_ns if ts_ns is not None else time.time_ns())
+        day = trading_day(ts_ns)
+        segment = f"segments/{day}/{scan_id}.npz"
+        buffer = io.BytesIO()
+        np.savez_compressed(buffer, **_columns(rows))
+        atomic_write(self.root / segment, [buffer.getvalue()])
+
+        with file_lock(self.root / ".append.lock"):
+            with self._lock:
+                self._refresh()
+                seq = len(self._catalog)
+            entry = {"seq": seq, "scan_id": scan_id, "ts": ts_ns, "day": day, "universe": universe, "mode": mode, "rows": len(rows), "segment": segment}
+            # Catalog first: a crash before the index write loses ticker lookups
+            # for this scan but never points index records at the wrong scan.
+            with open(self.root / self.CATALOG, "ab") as handle:
+                handle.write((json.dumps(entry) + "\n").encode("utf-8"))
+            records = np.zeros(len(rows), dtype=_INDEX_DTYPE)
+            records["ticker"] = [str(row["ticker"]).encode("ascii", "replace")[:16] for row in rows]
+            records["ts"] = ts_ns
+            records["seq"] = seq
+            records["row"] = np.arange(len(rows))
+            with open(self.root / self.INDEX, "ab") as handle:
+                handle.write(records.tobytes())
+        with self._lock:
+            self._refresh()
+
+    def _refresh(self) -> None:
+        catalog_path = self.root / self.CATALOG
+        if catalog_path.exists():
+            with open(catalog_path, "rb") as handle:
+                handle.seek(self._catalog_offset)
+                tail = handle.read()
+            complete = tail[: tail.rfind(b"\n") + 1]
+            for line in complete.splitlines():
+                entry = json.loads(line)
+                self._by_scan[entry["scan_id"]] = len(self._catalog)
+                self._catalog.append(entry)
+            self._catalog_offset += len(complete)
+
+        index_path = self.root / self.INDEX
+        if index_path.exists():
+            count = (index_path.stat().st_size - self._index_offset) // _INDEX_DTYPE.itemsize
+            if count > 0:
+                tail = np.fromfile(index_path, dtype=_INDEX_DTYPE, count=count, offset=self._index_offset)
+                self._index = np.concatenate([self._index, tail])
+                self._index_offset += count * _INDEX_DTYPE.itemsize
+                self._order = None
+
+    def _snapshot(self) -> tuple[list[dict[str, Any]], np.ndarray, np.ndarray]:
+        with self._lock:
+            self._refresh()
+            if self._order is None:
+                self._order = np.lexsort((self._index["ts"], self._index["ticker"]))
+            return self._catalog, self._index, self._order
+
+    def _read_segment(self, entry: dict[str, Any], rows: list[int] | None = None) -> list[dict[str, Any]]:
+        with np.load(self.root / entry["segment"], allow_pickle=False) as arrays:
+            columns = {name: arrays[name] for name in arrays.files}
+        positions = range(len(columns["ticker"])) if rows is None else rows
+        return [_row(columns, position) for position in positions]
+
+    def scans(self, universe: str | None = None, mode: str | None = None, limit: int = 50) -> list[dict[str, Any]]:
+        catalog, _, _ = self._snapshot()
+        matches = [entry for entry in catalog if (universe is None or entry["universe"] == universe) and (mode is None or entry["mode"] == mode)]
+        return [_scan_info(entry) for entry in reversed(matches[-limit:])]
+
+    def scan(self, scan_id: str) -> dict[str, Any] | None:
+        catalog, _, _ = self._snapshot()
+        seq = self._by_scan.get(scan_id)
+        if seq is None:
+            return None
+        entry = catalog[seq]
+        return {**_scan_info(entry), "results": self._read_segment(entry)}
+
+    def ticker_history(
+        self,
+        ticker: str,
+        limit: int = 30,
+        universe: str | None = None,
+        mode: str | None = None,
+        per_day: bool = True,
+    ) -> list[dict[str, Any]]:
+        """The ticker's rows from its ``limit`` most recent scans (last scan per day with ``per_day``), oldest first."""
+        catalog, index, order = self._snapshot()
+        key = ticker.strip().upper().encode("ascii", "replace")[:16]
+        tickers = index["ticker"][order]
+        matches = order[np.searchsorted(tickers, key, "left") : np.searchsorted(tickers, key, "right")]
+
+        picked: list[tuple[dict[str, Any], int]] = []
+        seen_days: set[str] = set()
+        for position in matches[::-1]:
+            record = index[position]
+            seq = int(record["seq"])
+            if seq >= len(catalog):
+                continue
+            entry = catalog[seq]
+            if (universe is not None and entry["universe"] != universe) or (mode is not None and entry["mode"] != mode):
+                continue
+            if per_day:
+                if entry["day"] in seen_days:
+                    continue
+                seen_days.add(entry["day"])
+            picked.append((entry, int(record["row"])))
+            if len(picked) >= limit:
+                break
+
+        points = []
+        for entry, row in reversed(picked):
+            points.append({**_scan_info(entry), **self._read_segment(entry, [row])[0]})
+        return points
+
+    def entered_top(self, universe: str, top: int = 20, day: date | None = None, mode: str | None = None) -> dict[str, Any]:
+        """Tickers in the top ``top`` of any scan on ``day`` that were not there at the previous day's close."""
+        catalog, _, _ = self._snapshot()
+        day_key = (day or datetime.now(ET).date()).isoformat()
+        scans = [entry for entry in catalog if entry["universe"] == universe and (mode is None or entry["mode"] == mode)]
+        before = [entry for entry in scans if entry["day"] < day_key]
+        today = [entry for entry in scans if entry["day"] == day_key]
+        baseline = before[-1] if before else None
+
+        def leaders(entry: dict[str, Any]) -> list[dict[str, Any]]:
+            return self._read_segment(entry, list(range(min(top, entry["rows"]))))
+
+        previous = {row["ticker"] for row in leaders(baseline)} if baseline else set()
+        entered: dict[str, dict[str, Any]] = {}
+        for entry in today:
+            for row in leaders(entry):
+                if row["ticker"] not in previous and row["ticker"] not in entered:
+                    entered[row["ticker"]] = {
+                        "ticker": row["ticker"],
+                        "entered_at": _iso(entry["ts"]),
+                        "entered_scan_id": entry["scan_id"],
+                        "entered_rank": row["rank"],
+                        "score": row["score"],
+                        "reasons": row["reasons"],
+                        "current_rank": None,
+                    }
+        if today:
+            for row in leaders(today[-1]):
+                if row["ticker"] in entered:
+                    entered[row["ticker"]]["current_rank"] = row["rank"]
+        tickers = sorted(entered.values(), key=lambda item: (item["current_rank"] is None, item["current_rank"] or 0, item["entered_at"]))
+        return {
+            "universe": universe,
+            "day": day_key,
+            "top": top,
+            "baseline_scan_id": baseline["scan_id"] if baseline else None,
+            "scans_today": len(today),
+            "tickers": tickers,
+        }
+
+
+def _columns(rows: list[dict[str, Any]]) -> dict[str, np.ndarray]:
+    columns: dict[str, np.ndarray] = {
+        "ticker": np.array([str(row["ticker"]) for row in rows], dtype=str),
+        "rank": np.arange(1, len(rows) + 1, dtype=np.int32),
+        "score": np.array([int(row["score"]) for row in rows], dtype=np.int16),
+        "reasons": np.array(["\n".join(row.get("reasons") or []) for row in rows], dtype=str),
+    }
+    for name in _FLOAT_COLUMNS:
+        columns[name] = np.array([np.nan if row.get(name) is None else float(row[name]) for row in rows], dtype=np.float64)
+    return columns
+
+
+def _row(columns: dict[str, np.ndarray], position: int) -> dict[str, Any]:
+    row: dict[str, Any] = {
+        "ticker": str(columns["ticker"][position]),
+        "rank": int(columns["rank"][position]),
+        "score": int(columns["score"][position]),
+        "reasons": [reason for reason in str(columns["reasons"][position]).split("\n") if reason],
+    }
+    for name in _FLOAT_COLUMNS:
+        value = float(columns[name][position])
+        row[name] = None if np.isnan(value) else value
+    return row
+
+
+def _iso(ts_ns: int) -> str:
+    return datetime.fromtimestamp(ts_ns / 1e9, tz=timezone.utc).isoformat()
+
+
+def _scan_info(entry: dict[str, Any]) -> dict[str, Any]:
+    return {
+        "scan_id": entry["scan_id"],
+        "timestamp": _iso(entry["ts"]),
+        "day": entry["day"],
+        "universe": entry["universe"],
+        "mode": entry["mode"],
+    }
+
+
+def build_history(cfg: dict[str, Any]) -> HistoryStore | None:
+    settings = cfg.get("history") or {}
+    if not settings.get("enabled", False):
+        return None
+    return HistoryStore(settings.get("path", "history"))
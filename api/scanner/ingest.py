@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+BAR_COLUMNS = ["Open", "High", "Low", "Close", "Volume"]
+PRICE_COLUMNS = ["Open", "High", "Low", "Close"]
+_UINT32_MAX = np.iinfo(np.uint32).max
+
+
+# Precision policy: timestamps are exact int64 nanoseconds. Prices are float32,
+# a relative error of at most 2**-24 (under $0.0001 at the $1,500 price
+# ceiling), so distinct one-cent ticks keep their order. Volume is uint32 when
+# every value is a whole number that fits, otherwise float32. Everything is
+# upcast to float64 before indicators and metrics are computed.
+class CompactBars:
+    """OHLCV bars pruned to the columns the scanner reads, stored compactly."""
+
+    __slots__ = ("ts", "tz", "index_name", "open", "high", "low", "close", "volume")
+
+    def __init__(
+        self,
+        ts: np.ndarray,
+        open: np.ndarray,
+        high: np.ndarray,
+        low: np.ndarray,
+        close: np.ndarray,
+        volume: np.ndarray,
+        tz: str = "",
+        index_name: str | None = None,
+    ) -> None:
+        self.ts = ts
+        self.open = open
+        self.high = high
+        self.low = low
+        self.close = close
+        self.volume = volume
+        self.tz = tz
+        self.index_name = index_name
+
+    def __len__(self) -> int:
+        return len(self.ts)
+
+    @property
+    def empty(self) -> bool:
+        return len(self.ts) == 0
+
+    @property
+    def nbytes(self) -> int:
+        return sum(getattr(self, name).nbytes for name in ("ts", "open", "high", "low", "close", "volume"))
+
+    def column(self, name: str) -> np.ndarray:
+        return getattr(self, name.lower())
+
+    def index(self) -> pd.DatetimeIndex:
+        index = pd.DatetimeIndex(self.ts.view("datetime64[ns]"), name=self.index_name)
+        return index.tz_localize("UTC").tz_convert(self.tz) if self.tz else index
+
+    def to_frame(self) -> pd.DataFrame:
+        return pd.DataFrame(
+            {name: self.column(name).astype(np.float64) for name in BAR_COLUMNS},
+            index=self.index(),
+        )
+
+    def slice(self, start: int, stop: int | None = None) -> "CompactBars":
+        window = slice(start, stop)
+        return CompactBars(
+            self.ts[window],
+            self.open[window],
+            self.high[window],
+            self.low[window],
+            self.close[window],
+            self.volume[window],
+            tz=self.tz,
+            index_name=self.index_name,
+        )
+
+    @classmethod
+    def concat(cls, parts: list["CompactBars"]) -> "CompactBars":
+        if not parts:
+            return cls.empty_bars()
+
+        def joined(name: str) -> np.ndarray:
+            return np.concatenate([getattr(part, name) for part in parts])
+
+        return cls(
+            joined("ts"),
+            joined("open").astype(np.float32, copy=False),
+            joined("high").astype(np.float32, copy=False),
+            joined("low").astype(np.float32, copy=False),
+            joined("close").astype(np.float32, copy=False),
+            _compact_volume(joined("volume").astype(np.float64)),
+            tz=parts[0].tz,
+            index_name=parts[0].index_name,
+        )
+
+    @classmethod
+    def empty_bars(cls) -> "CompactBars":
+        prices = np.empty(0, dtype=np.float32)
+        return cls(np.empty(0, dtype=np.int64), prices, prices, prices, prices, np.empty(0, dtype=np.uint32))
+
+
+def stored_price(value: float) -> float:
+    """The shortest decimal that rounds to the same float32 as ``value`` (177.05, not 177.0500030517578)."""
+    return float(str(np.float32(value)))
+
+
+def stored_prices(values: np.ndarray) -> list[float | None]:
+    return [None if np.isnan(value) else stored_price(value) for value in values]
+
+
+def _flatten_columns(frame: pd.DataFrame) -> pd.DataFrame:
+    # yfinance returns (Price, Ticker) column headers; keep the level holding OHLCV.
+    if not isinstance(frame.columns, pd.MultiIndex):
+        return frame
+    for level in range(frame.columns.nlevels):
+        values = frame.columns.get_level_values(level)
+        if "Close" in set(values):
+            frame = frame.copy()
+            frame.columns = values
+            return frame.loc[:, ~frame.columns.duplicated()]
+    return frame
+
+
+def _timestamps(frame: pd.DataFrame) -> tuple[np.ndarray, str, str | None]:
+    index = frame.index
+    if not isinstance(index, pd.DatetimeIndex):
+        datetime_columns = [column for column in frame.columns if pd.api.types.is_datetime64_any_dtype(frame[column])]
+        if not datetime_columns:
+            raise ValueError("bars have no timestamp index or column")
+        index = pd.DatetimeIndex(frame[datetime_columns[0]], name=datetime_columns[0])
+    tz = str(index.tz) if index.tz is not None else ""
+    wall = index.tz_convert("UTC").tz_localize(None) if index.tz is not None else index
+    return wall.as_unit("ns").asi8.astype(np.int64, copy=False), tz, index.name
+
+
+def _compact_volume(values: np.ndarray) -> np.ndarray:
+    finite = values[np.isfinite(values)]
+    if len(finite) == len(values) and (finite >= 0).all() and (finite <= _UINT32_MAX).all() and (finite == np.floor(finite)).all():
+        return values.astype(np.uint32)
+    return values.astype(np.float32)
+
+
+def compact_frame(frame: pd.DataFrame | CompactBars | None) -> CompactBars:
+    if isinstance(frame, CompactBars):
+        return frame
+    if frame is None or frame.empty:
+        return CompactBars.empty_bars()
+    frame = _flatten_columns(frame)
+    ts, tz, index_name = _timestamps(frame)
+
+    def numeric(name: str) -> np.ndarray:
+        if name not in frame:
+            return np.full(len(frame), np.nan)
+        return pd.to_numeric(frame[name], errors="coerce").to_numpy(dtype=np.float64)
+
+    prices = {name: numeric(name).astype(np.float32) for name in PRICE_COLUMNS}
+    return CompactBars(
+        ts,
+        prices["Open"],
+        prices["High"],
+        prices["Low"],
+        prices["Close"],
+        _compact_volume(numeric("Volume")),
+        tz=tz,
+        index_name=index_name,
+    )
+
+
+def compact_payload(bars: dict[str, Any]) -> dict[str, Any]:
+    """Prune and compact the frames a ``BarSource`` returned, leaving errors as they are."""
+    if "error" in bars:
+        return bars
+    try:
+        return {"ticker": bars["ticker"], "daily": compact_frame(bars["daily"]), "intra": compact_frame(bars.get("intra"))}
+    except Exception as exc:
+        return {"ticker": bars["ticker"], "error": str(exc)}
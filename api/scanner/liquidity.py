@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+import math
+import threading
+from typing import Any, Iterable
+
+from .cache import LIQUIDITY, CacheBackend
+
+_KEY = "avg20_dollar_vol"
+
+
+class LiquidityEstimates:
+    """Last seen 20-day average dollar volume per ticker, so scans fetch the most liquid names first."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._values: dict[str, float] = {}
+
+    def order(self, tickers: list[str], cache: CacheBackend | None = None) -> list[str]:
+        if cache is not None:
+            self._merge(cache.get(LIQUIDITY, _KEY) or {})
+        with self._lock:
+            values = dict(self._values)
+        return sorted(tickers, key=lambda ticker: (0, -values[ticker]) if ticker in values else (1, 0.0))
+
+    def update(self, items: Iterable[tuple[str, Any]]) -> None:
+        with self._lock:
+            for ticker, value in items:
+                try:
+                    value = float(value)
+                except (TypeError, ValueError):
+                    continue
+                if not math.isnan(value):
+                    self._values[ticker] = value
+
+    def save(self, cache: CacheBackend, ttl: float | None = None) -> None:
+        with self._lock:
+            values = dict(self._values)
+        cache.set(LIQUIDITY, _KEY, values, ttl=ttl)
+
+    def _merge(self, stored: dict[str, float]) -> None:
+        # This process's own observations are newer than anything it reads back.
+        with self._lock:
+            for ticker, value in stored.items():
+                self._values.setdefault(ticker, value)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._values)
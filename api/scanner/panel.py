@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+from .ingest import CompactBars
+
+PANEL_FIELDS = ["Open", "High", "Low", "Close", "Volume"]
+
+
+def rolling_mean(values: np.ndarray, window: int, min_periods: int) -> np.ndarray:
+    """NaN-aware trailing mean down axis 0, matching ``Series.rolling(...).mean()``."""
+    valid = ~np.isnan(values)
+    sums = np.cumsum(np.where(valid, values, 0.0), axis=0)
+    counts = np.cumsum(valid, axis=0)
+    if window < len(values):
+        sums[window:] = sums[window:] - sums[:-window]
+        counts[window:] = counts[window:] - counts[:-window]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        out = sums / counts
+    out[(counts < max(min_periods, 1))] = np.nan
+    return out
+
+
+def ewm_mean(values: np.ndarray, alpha: float) -> np.ndarray:
+    """``ewm(alpha=alpha, adjust=False).mean()`` for every column at once, NaN handling included."""
+    out = np.empty_like(values, dtype=np.float64)
+    if len(values) == 0:
+        return out
+    weighted = values[0].astype(np.float64, copy=True)
+    old_wt = np.ones(values.shape[1:], dtype=np.float64)
+    out[0] = weighted
+    decay = 1.0 - alpha
+    for row in range(1, len(values)):
+        current = values[row]
+        observed = ~np.isnan(current)
+        started = ~np.isnan(weighted)
+
+        old_wt = np.where(started, old_wt * decay, old_wt)
+        update = started & observed
+        blended = (old_wt * weighted + alpha * current) / (old_wt + alpha)
+        weighted = np.where(update, np.where(weighted != current, blended, weighted), weighted)
+        old_wt = np.where(update, 1.0, old_wt)
+        weighted = np.where(~started & observed, current, weighted)
+        out[row] = weighted
+    return out
+
+
+def true_range(high: np.ndarray, low: np.ndarray, close: np.ndarray) -> np.ndarray:
+    prev_close = np.full_like(close, np.nan)
+    prev_close[1:] = close[:-1]
+    # fmax skips NaN like DataFrame.max(axis=1), so the first bar is just high - low.
+    return np.fmax(np.fmax(np.abs(high - low), np.abs(high - prev_close)), np.abs(low - prev_close))
+
+
+def panel_sma(close: np.ndarray, period: int) -> np.ndarray:
+    return rolling_mean(close, period, period // 2)
+
+
+def panel_rsi(close: np.ndarray, period: int = 14) -> np.ndarray:
+    delta = np.full_like(close, np.nan)
+    delta[1:] = close[1:] - close[:-1]
+    up = np.where(delta > 0, delta, np.where(np.isnan(delta), np.nan, 0.0))
+    down = np.where(delta < 0, -delta, np.where(np.isnan(delta), np.nan, 0.0))
+    alpha = 2.0 / (period + 1.0)
+    roll_up = ewm_mean(up, alpha)
+    roll_down = ewm_mean(down, alpha)
+    roll_down[roll_down == 0] = np.nan
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return 100.0 - (100.0 / (1.0 + roll_up / roll_down))
+
+
+def panel_atr(high: np.ndarray, low: np.ndarray, close: np.ndarray, period: int = 14) -> np.ndarray:
+    return ewm_mean(true_range(high, low, close), 1.0 / period)
+
+
+def indicator_columns(indicator_cfg: dict[str, Any]) -> list[str]:
+    """Names of the indicator columns ``BarPanel.compute`` adds for this config."""
+    periods = [f"SMA{int(period)}" for period in indicator_cfg.get("ma_periods", [20, 50, 200])]
+    return periods + [f"RSI{int(indicator_cfg.get('rsi_period', 14))}", f"ATR{int(indicator_cfg.get('atr_period', 14))}"]
+
+
+class BarPanel:
+    """Daily bars for a universe as (bars x tickers) arrays, right-aligned on each ticker's latest bar."""
+
+    def __init__(self, tickers: list[str], bars: list[CompactBars]) -> None:
+        self.tickers = list(tickers)
+        self.bars = bars
+        self.lengths = np.array([len(item) for item in bars], dtype=np.int64)
+        self.depth = depth = int(self.lengths.max()) if len(bars) else 0
+        self.fields: dict[str, np.ndarray] = {}
+        for field in PANEL_FIELDS:
+            values = np.full((depth, len(bars)), np.nan)
+            for column, item in enumerate(bars):
+                if len(item):
+                    values[depth - len(item) :, column] = item.column(field)
+            self.fields[field] = values
+        self.indicators: dict[str, np.ndarray] = {}
+
+    @classmethod
+    def from_bars(cls, bars: list[dict[str, Any]]) -> "BarPanel":
+        return cls([item["ticker"] for item in bars], [item["daily"] for item in bars])
+
+    def compute(self, indicator_cfg: dict[str, Any]) -> "BarPanel":
+        close = self.fields["Close"]
+        for period in indicator_cfg.get("ma_periods", [20, 50, 200]):
+            self.indicators[f"SMA{period}"] = panel_sma(close, int(period))
+        rsi_period = int(indicator_cfg.get("rsi_period", 14))
+        self.indicators[f"RSI{rsi_period}"] = panel_rsi(close, rsi_period)
+        atr_period = int(indicator_cfg.get("atr_period", 14))
+        self.indicators[f"ATR{atr_period}"] = panel_atr(self.fields["High"], self.fields["Low"], close, atr_period)
+        return self
+
+    def frame(self, position: int) -> pd.DataFrame:
+        """The ticker's own daily frame (float64) with the panel's indicator columns attached."""
+        frame = self.bars[position].to_frame()
+        start = self.depth - int(self.lengths[position])
+        for name, values in self.indicators.items():
+            frame[name] = values[start:, position]
+        return frame
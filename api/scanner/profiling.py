@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import collections
+import contextlib
+import os
+import sys
+import threading
+import time
+import tracemalloc
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Iterator
+
+from .config import ROOT_DIR
+
+_TRACE_LOCK = threading.Lock()
+_TRACE_USERS = 0
+
+
+def _location(filename: str, lineno: int) -> str:
+    path = os.path.abspath(filename)
+    root = str(ROOT_DIR)
+    if path.startswith(root + os.sep):
+        path = os.path.relpath(path, root)
+    else:
+        path = os.sep.join(path.split(os.sep)[-2:])
+    return f"{path}:{lineno}"
+
+
+class StackSampler:
+    """Samples every thread's Python stack on a timer and counts collapsed (flame graph) stacks."""
+
+    def __init__(self, interval_s: float = 0.005) -> None:
+        self.interval_s = interval_s
+        self.counts: collections.Counter[str] = collections.Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="scan-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self) -> None:
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval_s):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({_location(code.co_filename, code.co_firstlineno)})")
+                    frame = frame.f_back
+                stack.append(names.get(ident, f"thread-{ident}"))
+                self.counts[";".join(reversed(stack))] += 1
+            self.samples += 1
+
+    def collapsed(self) -> str:
+        return "\n".join(f"{stack} {count}" for stack, count in self.counts.most_common())
+
+
+@contextlib.contextmanager
+def _tracing(frames: int) -> Iterator[None]:
+    # tracemalloc is process-wide; the first capture starts it and the last stops it.
+    global _TRACE_USERS
+    with _TRACE_LOCK:
+        if _TRACE_USERS == 0 and not tracemalloc.is_tracing():
+            tracemalloc.start(frames)
+        _TRACE_USERS += 1
+        tracemalloc.reset_peak()
+    try:
+        yield
+    finally:
+        with _TRACE_LOCK:
+            _TRACE_USERS -= 1
+            if _TRACE_USERS == 0:
+                tracemalloc.stop()
+
+
+def _top_allocations(snapshot: tracemalloc.Snapshot, limit: int) -> list[dict[str, Any]]:
+    snapshot = snapshot.filter_traces(
+        [
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+            tracemalloc.Filter(False, "<frozen importlib.*>"),
+        ]
+    )
+    return [
+        {
+            "location": _location(stat.traceback[0].filename, stat.traceback[0].lineno),
+            "size_bytes": stat.size,
+            "count": stat.count,
+        }
+        for stat in snapshot.statistics("lineno")[:limit]
+    ]
+
+
+@contextlib.contextmanager
+def capture_profile(cfg: dict[str, Any]) -> Iterator[dict[str, Any]]:
+    """Profile the block with the stack sampler and tracemalloc into the yielded dict."""
+    settings = cfg.get("profiling") or {}
+    profile: dict[str, Any] = {
+        "profile_id": uuid.uuid4().hex,
+        "started_at": datetime.now(timezone.utc).isoformat(),
+        "sample_interval_ms": float(settings.get("sample_interval_ms", 5)),
+    }
+    sampler = StackSampler(profile["sample_interval_ms"] / 1000.0)
+    with _tracing(int(settings.get("traceback_frames", 1))):
+        started = time.perf_counter()
+        sampler.start()
+        try:
+            yield profile
+        finally:
+            sampler.stop()
+            profile["duration_s"] = time.perf_counter() - started
+            snapshot = tracemalloc.take_snapshot()
+            _, peak = tracemalloc.get_traced_memory()
+    profile["samples"] = sampler.samples
+    profile["collapsed"] = sampler.collapsed()
+    profile["peak_traced_bytes"] = peak
+    profile["allocations"] = _top_allocations(snapshot, int(settings.get("top_allocations", 25)))
@@ -0,0 +1,335 @@
+from __future__ import annotations
+
+import asyncio
+import io
+import json
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable
+from urllib.parse import quote
+
+import numpy as np
+import pandas as pd
+
+from .cache import atomic_write, file_lock
+from .config import ROOT_DIR, SAMPLE_DATA_DIR
+
+_SOURCES: dict[str, Callable[[dict[str, Any]], "BarSource"]] = {}
+
+
+class BarSource:
+    """Raw daily and 1-minute bars: ``{"ticker", "daily", "intra"}`` or ``{"ticker", "error"}``."""
+
+    name = ""
+
+    def __init__(self, cfg: dict[str, Any]) -> None:
+        self.cfg = cfg
+
+    @property
+    def key(self) -> str:
+        return self.name
+
+    @property
+    def uses_http(self) -> bool:
+        return False
+
+    def load(self, ticker: str) -> dict[str, Any]:
+        raise NotImplementedError
+
+    async def load_async(self, ticker: str, client: Any | None = None) -> dict[str, Any]:
+        return await asyncio.to_thread(self.load, ticker)
+
+
+def register_source(name: str) -> Callable[[type[BarSource]], type[BarSource]]:
+    def decorator(cls: type[BarSource]) -> type[BarSource]:
+        cls.name = name
+        _SOURCES[name] = cls
+        return cls
+
+    return decorator
+
+
+def available_modes() -> list[str]:
+    return sorted(_SOURCES)
+
+
+def get_source(mode: str, cfg: dict[str, Any]) -> BarSource:
+    try:
+        factory = _SOURCES[mode]
+    except KeyError as exc:
+        raise ValueError(f"Unknown data mode: {mode}") from exc
+    return factory(cfg)
+
+
+def _provider_settings(cfg: dict[str, Any], name: str) -> dict[str, Any]:
+    return (cfg.get("providers") or {}).get(name) or {}
+
+
+def _resolve_path(value: str | Path) -> Path:
+    path = Path(value)
+    return path if path.is_absolute() else ROOT_DIR / path
+
+
+def open_http_client(cfg: dict[str, Any]) -> Any | None:
+    """Pooled ``httpx.AsyncClient`` shared by a scan's HTTP fetches, or ``None`` without httpx."""
+    try:
+        import httpx
+    except Exception:
+        return None
+    settings = _provider_settings(cfg, "live")
+    max_connections = int(settings.get("max_connections", 20))
+    return httpx.AsyncClient(
+        base_url=str(settings.get("base_url", "https://query1.finance.yahoo.com")),
+        headers={"User-Agent": str(settings.get("user_agent", "Mozilla/5.0"))},
+        limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+        timeout=float(settings.get("timeout_s", 15)),
+    )
+
+
+@register_source("live")
+class LiveSource(BarSource):
+    """Yahoo Finance bars: the chart API through the pooled client, or ``yfinance`` for sync callers."""
+
+    @property
+    def uses_http(self) -> bool:
+        return True
+
+    async def load_async(self, ticker: str, client: Any | None = None) -> dict[str, Any]:
+        if client is None:
+            return await super().load_async(ticker)
+        try:
+            daily, intra = await asyncio.gather(
+                self._chart(client, ticker, "300d", "1d", prepost=False),
+                self._chart(client, ticker, "1d", "1m", prepost=True),
+            )
+        except Exception as exc:
+            return {"ticker": ticker, "error": str(exc)}
+        if daily.empty:
+            return {"ticker": ticker, "error": "no daily"}
+        return {"ticker": ticker, "daily": daily, "intra": intra}
+
+    @staticmethod
+    async def _chart(client: Any, ticker: str, period: str, interval: str, prepost: bool) -> pd.DataFrame:
+        response = await client.get(
+            f"/v8/finance/chart/{quote(ticker, safe='')}",
+            params={"range": period, "interval": interval, "includePrePost": "true" if prepost else "false"},
+        )
+        response.raise_for_status()
+        return _chart_frame(response.json(), daily=interval == "1d")
+
+    def load(self, ticker: str) -> dict[str, Any]:
+        try:
+            import yfinance as yf
+        except Exception:
+            return {"ticker": ticker, "error": "yfinance not installed"}
+
+        try:
+            daily = yf.download(ticker, period="300d", interval="1d", auto_adjust=False, prepost=False, progress=False, threads=False)
+            if daily is None or daily.empty:
+                return {"ticker": ticker, "error": "no daily"}
+            intra = yf.download(ticker, period="1d", interval="1m", auto_adjust=False, prepost=True, progress=False, threads=False)
+            return {"ticker": ticker, "daily": daily, "intra": intra}
+        except Exception as exc:
+            return {"ticker": ticker, "error": str(exc)}
+
+
+def _chart_frame(payload: dict[str, Any], daily: bool) -> pd.DataFrame:
+    """Chart API response as the frame ``yf.download`` would return for it."""
+    chart = payload.get("chart") or {}
+    if chart.get("error"):
+        error = chart["error"]
+        raise ValueError(error.get("description") if isinstance(error, dict) else str(error))
+    result = (chart.get("result") or [{}])[0] or {}
+    timestamps = result.get("timestamp") or []
+    if not timestamps:
+        return pd.DataFrame()
+
+    tz = (result.get("meta") or {}).get("exchangeTimezoneName") or "America/New_York"
+    index = pd.to_datetime(np.asarray(timestamps, dtype=np.int64), unit="s", utc=True).tz_convert(tz)
+    if daily:
+        index = index.tz_localize(None).normalize()
+    index.name = "Date" if daily else "Datetime"
+
+    indicators = result.get("indicators") or {}
+    quotes = (indicators.get("quote") or [{}])[0] or {}
+    columns = {name: np.array(quotes.get(name.lower()) or [np.nan] * len(timestamps), dtype=np.float64) for name in ["Open", "High", "Low", "Close"]}
+    adjclose = (indicators.get("adjclose") or [{}])[0] or {}
+    if adjclose.get("adjclose"):
+        columns["Adj Close"] = np.array(adjclose["adjclose"], dtype=np.float64)
+    columns["Volume"] = np.array(quotes.get("volume") or [np.nan] * len(timestamps), dtype=np.float64)
+    frame = pd.DataFrame(columns, index=index)
+    return frame.dropna(how="all", subset=["Open", "High", "Low", "Close"])
+
+
+@register_source("sample")
+class SampleSource(BarSource):
+    def load(self, ticker: str) -> dict[str, Any]:
+        daily_path = SAMPLE_DATA_DIR / f"{ticker}_daily.csv"
+        if not daily_path.exists():
+            return {"ticker": ticker, "error": "no sample data"}
+
+        daily = _read_sample_csv(daily_path, "Date")
+        intraday_path = SAMPLE_DATA_DIR / f"{ticker}_intraday.csv"
+        intra = pd.DataFrame()
+        if intraday_path.exists():
+            intra = _read_sample_csv(intraday_path, "Datetime")
+            if getattr(intra["Datetime"].dt, "tz", None) is None:
+                intra["Datetime"] = intra["Datetime"].dt.tz_localize("America/New_York")
+            else:
+                intra["Datetime"] = intra["Datetime"].dt.tz_convert("America/New_York")
+            intra = intra.set_index("Datetime")
+        return {"ticker": ticker, "daily": daily, "intra": intra}
+
+
+def _read_sample_csv(path, date_column: str) -> pd.DataFrame:
+    frame = pd.read_csv(path, skiprows=[1] if _has_ticker_header(path) else None)
+    frame[date_column] = pd.to_datetime(frame[date_column], errors="coerce")
+    frame = frame.dropna(subset=[date_column]).copy()
+    numeric_columns = [column for column in frame.columns if column != date_column]
+    for column in numeric_columns:
+        frame[column] = pd.to_numeric(frame[column], errors="coerce")
+    return frame
+
+
+def _has_ticker_header(path) -> bool:
+    with open(path, "r", encoding="utf-8") as handle:
+        handle.readline()
+        second = handle.readline()
+    return second.startswith(",")
+
+
+class BarArchive:
+    """Directory of recorded bars: one compressed ``.npz`` per ticker plus a manifest."""
+
+    MANIFEST = "manifest.json"
+
+    def __init__(self, root: str | Path) -> None:
+        self.root = _resolve_path(root)
+        self._lock = threading.Lock()
+
+    def _path(self, ticker: str) -> Path:
+        return self.root / f"{ticker}.npz"
+
+    def tickers(self) -> list[str]:
+        return sorted(self.manifest().get("tickers", {}))
+
+    def manifest(self) -> dict[str, Any]:
+        try:
+            return json.loads((self.root / self.MANIFEST).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+
+    def write(self, ticker: str, daily: pd.DataFrame, intra: pd.DataFrame | None, source: str) -> None:
+        arrays: dict[str, np.ndarray] = {}
+        _pack_frame(arrays, "daily", daily)
+        _pack_frame(arrays, "intra", intra if intra is not None else pd.DataFrame())
+        buffer = io.BytesIO()
+        np.savez_compressed(buffer, **arrays)
+        atomic_write(self._path(ticker), [buffer.getvalue()])
+
+        recorded_at = datetime.now(timezone.utc).isoformat()
+        with self._lock, file_lock(self.root / ".manifest.lock"):
+            manifest = self.manifest()
+            manifest.setdefault("created_at", recorded_at)
+            manifest["source"] = source
+            manifest.setdefault("tickers", {})[ticker] = recorded_at
+            atomic_write(self.root / self.MANIFEST, [json.dumps(manifest, indent=2, sort_keys=True).encode("utf-8")])
+
+    def read(self, ticker: str) -> dict[str, Any]:
+        path = self._path(ticker)
+        if not path.exists():
+            return {"ticker": ticker, "error": "not recorded"}
+        with np.load(path, allow_pickle=False) as arrays:
+            return {"ticker": ticker, "daily": _unpack_frame(arrays, "daily"), "intra": _unpack_frame(arrays, "intra")}
+
+
+def _pack_frame(arrays: dict[str, np.ndarray], prefix: str, frame: pd.DataFrame) -> None:
+    if isinstance(frame.columns, pd.MultiIndex):
+        frame = frame.copy()
+        frame.columns = frame.columns.get_level_values(0)
+    if not isinstance(frame.index, pd.DatetimeIndex):
+        datetime_columns = [column for column in frame.columns if pd.api.types.is_datetime64_any_dtype(frame[column])]
+        if datetime_columns:
+            frame = frame.set_index(datetime_columns[0])
+    index = pd.DatetimeIndex(frame.index) if len(frame) else pd.DatetimeIndex([])
+    tz = str(index.tz) if index.tz is not None else ""
+    values = index.tz_convert("UTC").tz_localize(None) if index.tz is not None else index
+    columns = [str(column) for column in frame.columns]
+
+    arrays[f"{prefix}__index"] = values.as_unit("ns").asi8.astype(np.int64)
+    arrays[f"{prefix}__meta"] = np.array([tz, str(frame.index.name or "")])
+    arrays[f"{prefix}__columns"] = np.array(columns, dtype=str)
+    for position, column in enumerate(columns):
+        arrays[f"{prefix}__{position}"] = pd.to_numeric(frame.iloc[:, position], errors="coerce").to_numpy(dtype=np.float64)
+
+
+def _unpack_frame(arrays: Any, prefix: str) -> pd.DataFrame:
+    columns = [str(column) for column in arrays[f"{prefix}__columns"]]
+    tz, index_name = (str(value) for value in arrays[f"{prefix}__meta"])
+    index = pd.DatetimeIndex(arrays[f"{prefix}__index"].astype("datetime64[ns]"), name=index_name or None)
+    if tz:
+        index = index.tz_localize("UTC").tz_convert(tz)
+    if not columns:
+        return pd.DataFrame()
+    return pd.DataFrame({column: arrays[f"{prefix}__{position}"] for position, column in enumerate(columns)}, index=index)
+
+
+@register_source("record")
+class RecordingSource(BarSource):
+    """Pass-through to another source that also writes every response to an archive."""
+
+    def __init__(self, cfg: dict[str, Any]) -> None:
+        super().__init__(cfg)
+        settings = _provider_settings(cfg, "record")
+        self.inner = get_source(settings.get("source", "live"), cfg)
+        self.archive = BarArchive(settings.get("archive", "recordings/latest"))
+
+    @property
+    def uses_http(self) -> bool:
+        return self.inner.uses_http
+
+    def load(self, ticker: str) -> dict[str, Any]:
+        bars = self.inner.load(ticker)
+        if "error" not in bars:
+            self.archive.write(ticker, bars["daily"], bars.get("intra"), source=self.inner.name)
+        return bars
+
+    async def load_async(self, ticker: str, client: Any | None = None) -> dict[str, Any]:
+        bars = await self.inner.load_async(ticker, client)
+        if "error" not in bars:
+            await asyncio.to_thread(self.archive.write, ticker, bars["daily"], bars.get("intra"), self.inner.name)
+        return bars
+
+
+@register_source("replay")
+class ReplaySource(BarSource):
+    """Serve a recorded archive back, optionally sleeping to mimic network latency."""
+
+    def __init__(self, cfg: dict[str, Any]) -> None:
+        super().__init__(cfg)
+        settings = _provider_settings(cfg, "replay")
+        self.archive = BarArchive(settings.get("archive", "recordings/latest"))
+        self.latency_ms = float(settings.get("latency_ms", 0) or 0)
+        self.jitter_ms = float(settings.get("jitter_ms", 0) or 0)
+
+    @property
+    def key(self) -> str:
+        return f"replay:{self.archive.root}"
+
+    def _delay(self) -> float:
+        return (self.latency_ms + (random.uniform(0, self.jitter_ms) if self.jitter_ms else 0.0)) / 1000.0
+
+    def load(self, ticker: str) -> dict[str, Any]:
+        delay = self._delay()
+        if delay > 0:
+            time.sleep(delay)
+        return self.archive.read(ticker)
+
+    async def load_async(self, ticker: str, client: Any | None = None) -> dict[str, Any]:
+        delay = self._delay()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return await asyncio.to_thread(self.archive.read, ticker)
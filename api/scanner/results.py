@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import base64
+import hashlib
+import json
+from typing import Any
+
+import numpy as np
+
+RANGE_FIELDS = ["score", "gap_pct", "rel_dollar_vol", "price"]
+SORT_KEYS = ["rank", "ticker", "score", "gap_pct", "rel_dollar_vol", "avg20_dollar_vol", "price", "premarket_last"]
+_NUMERIC = [key for key in SORT_KEYS if key not in {"rank", "ticker"}]
+
+
+class CursorError(ValueError):
+    pass
+
+
+class ScanResults:
+    """A finished scan's rows with a precomputed order for every sort key."""
+
+    def __init__(self, scan_id: str, rows: list[dict[str, Any]]) -> None:
+        self.scan_id = scan_id
+        self.rows = rows
+        self.values = {key: np.array([_number(row.get(key)) for row in rows], dtype=np.float64) for key in _NUMERIC}
+        self.reasons = ["\n".join(row.get("reasons") or []).lower() for row in rows]
+        rank = np.arange(len(rows))
+        tickers = np.array([row["ticker"] for row in rows], dtype=str)
+        self.orders: dict[tuple[str, bool], np.ndarray] = {
+            ("rank", False): rank,
+            ("rank", True): rank[::-1].copy(),
+            ("ticker", False): np.lexsort((rank, tickers)),
+            ("ticker", True): np.lexsort((rank, tickers))[::-1].copy(),
+        }
+        for key in _NUMERIC:
+            values = self.values[key]
+            missing = np.isnan(values)
+            filled = np.where(missing, 0.0, values)
+            self.orders[(key, False)] = np.lexsort((rank, filled, missing))
+            self.orders[(key, True)] = np.lexsort((rank, -filled, missing))
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def page(
+        self,
+        sort: str,
+        descending: bool,
+        ranges: dict[str, tuple[float | None, float | None]],
+        reasons: list[str],
+        limit: int,
+        position: int = 0,
+    ) -> tuple[list[dict[str, Any]], int | None]:
+        """Up to ``limit`` matching rows from ``position`` in the sort order, and the next position."""
+        order = self.orders[(sort, descending)]
+        needles = [reason.lower() for reason in reasons if reason]
+        picked: list[int] = []
+        while position < len(order) and len(picked) < limit:
+            chunk = order[position : position + max(limit, 64)]
+            mask = np.ones(len(chunk), dtype=bool)
+            for key, (low, high) in ranges.items():
+                values = self.values[key][chunk]
+                if low is not None:
+                    mask &= values >= low
+                if high is not None:
+                    mask &= values <= high
+            if needles:
+                mask &= np.array([all(needle in self.reasons[row] for needle in needles) for row in chunk], dtype=bool)
+            offsets = np.flatnonzero(mask)[: limit - len(picked)]
+            picked.extend(int(row) for row in chunk[offsets])
+            position += int(offsets[-1]) + 1 if len(picked) == limit else len(chunk)
+        return [self.rows[row] for row in picked], position if position < len(order) else None
+
+
+def _number(value: Any) -> float:
+    try:
+        return float(value) if value is not None else np.nan
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def query_fingerprint(sort: str, descending: bool, ranges: dict[str, Any], reasons: list[str]) -> str:
+    text = json.dumps([sort, descending, sorted(ranges.items()), sorted(reasons)], default=str)
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()[:12]
+
+
+def encode_cursor(position: int, fingerprint: str) -> str:
+    raw = json.dumps({"p": position, "q": fingerprint}).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, fingerprint: str) -> int:
+    try:
+        data = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        position = int(data["p"])
+    except Exception as exc:
+        raise CursorError("Malformed cursor") from exc
+    if data.get("q") != fingerprint or position < 0:
+        raise CursorError("Cursor does not belong to this query; restart without a cursor")
+    return position
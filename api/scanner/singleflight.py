@@ -0,0 +1,24 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Awaitable, Callable, Hashable
+
+
+class AsyncSingleFlight:
+    """Collapse concurrent awaits that share a key (per event loop) into one in-flight task."""
+
+    def __init__(self) -> None:
+        self._calls: dict[tuple[int, Hashable], asyncio.Task[Any]] = {}
+
+    async def do(self, key: Hashable, fn: Callable[..., Awaitable[Any]], *args: Any, **kwargs: Any) -> Any:
+        loop = asyncio.get_running_loop()
+        slot = (id(loop), key)
+        task = self._calls.get(slot)
+        if task is None:
+            task = loop.create_task(fn(*args, **kwargs))
+            self._calls[slot] = task
+            task.add_done_callback(lambda _: self._calls.pop(slot, None))
+        return await asyncio.shield(task)
+
+    def in_flight(self) -> int:
+        return len(self._calls)
@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import collections
+import threading
+from typing import Any, Hashable
+
+import numpy as np
+
+from .ingest import CompactBars, _compact_volume
+
+_MINUTE_NS = 60 * 1_000_000_000
+_DAY_NS = 24 * 60 * _MINUTE_NS
+
+# timeframe -> (base series in the fetched bars, bucket width in minutes; 0 = calendar week)
+TIMEFRAMES: dict[str, tuple[str, int]] = {
+    "5m": ("intra", 5),
+    "15m": ("intra", 15),
+    "1w": ("daily", 0),
+}
+
+
+def _bucket_ids(bars: CompactBars, minutes: int) -> np.ndarray:
+    if minutes:
+        # Whole-hour UTC offsets keep minute buckets aligned with the exchange clock.
+        return bars.ts // (minutes * _MINUTE_NS)
+    wall = bars.index().tz_localize(None).as_unit("ns").asi8 if bars.tz else bars.ts
+    # 1970-01-01 was a Thursday; shifting by three days makes weeks start on Monday.
+    return (wall // _DAY_NS + 3) // 7
+
+
+def resample(bars: CompactBars, timeframe: str) -> tuple[CompactBars, np.ndarray]:
+    """Aggregate ``bars`` into ``timeframe`` candles, with the base position each candle starts at."""
+    if bars.empty:
+        return CompactBars.empty_bars(), np.empty(0, dtype=np.int64)
+    _, minutes = TIMEFRAMES[timeframe]
+    ids = _bucket_ids(bars, minutes)
+    starts = np.flatnonzero(np.r_[True, ids[1:] != ids[:-1]])
+    ends = np.append(starts[1:], len(bars)) - 1
+    stamps = ids[starts] * (minutes * _MINUTE_NS) if minutes else bars.ts[starts]
+    candles = CompactBars(
+        stamps.astype(np.int64),
+        bars.open[starts],
+        np.fmax.reduceat(bars.high, starts),
+        np.fmin.reduceat(bars.low, starts),
+        bars.close[ends],
+        _compact_volume(np.add.reduceat(np.nan_to_num(bars.volume.astype(np.float64)), starts)),
+        tz=bars.tz,
+        index_name=bars.index_name,
+    )
+    return candles, starts
+
+
+class TimeframeCache:
+    """Higher-timeframe candles per ticker, extended as new base bars arrive."""
+
+    def __init__(self, max_entries: int = 8192) -> None:
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: collections.OrderedDict[Hashable, tuple[CompactBars, np.ndarray, int, int]] = collections.OrderedDict()
+
+    def get(self, key: Hashable, base: CompactBars, timeframe: str) -> CompactBars:
+        with self._lock:
+            entry = self._entries.get(key)
+        candles, starts = self._extend(entry, base, timeframe)
+        with self._lock:
+            self._entries[key] = (candles, starts, int(base.ts[0]) if len(base) else 0, len(base))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return candles
+
+    @staticmethod
+    def _extend(
+        entry: tuple[CompactBars, np.ndarray, int, int] | None,
+        base: CompactBars,
+        timeframe: str,
+    ) -> tuple[CompactBars, np.ndarray]:
+        # Candles before the last cached one are final; rebuild only that one
+        # and newer while the base series still starts where it did.
+        if entry is not None and len(entry[1]) and len(base) >= entry[3] and int(base.ts[0]) == entry[2]:
+            candles, starts, _, _ = entry
+            resume = int(starts[-1])
+            tail, tail_starts = resample(base.slice(resume), timeframe)
+            if len(tail) and tail.ts[0] == candles.ts[-1]:
+                merged = CompactBars.concat([candles.slice(0, len(candles) - 1), tail])
+                return merged, np.concatenate([starts[:-1], tail_starts + resume])
+        return resample(base, timeframe)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+
+def configured_timeframes(cfg: dict[str, Any]) -> dict[str, dict[str, float]]:
+    """``scoring.timeframes``: rule weights per timeframe, validated."""
+    configured = (cfg.get("scoring") or {}).get("timeframes") or {}
+    unknown = sorted(set(configured) - set(TIMEFRAMES))
+    if unknown:
+        raise ValueError(f"Unknown timeframes in scoring.timeframes: {', '.join(unknown)} (expected {', '.join(TIMEFRAMES)})")
+    return {timeframe: dict(weights or {}) for timeframe, weights in configured.items()}
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import Literal
+from typing import Any, Literal
 
 from pydantic import BaseModel, Field
 
@@ -14,7 +14,12 @@ class UniverseOption(BaseModel):
 
 class ScanRequest(BaseModel):
     universe: str = Field(default="demo_sample.csv")
-    mode: Literal["live", "sample"] = "sample"
+    mode: Literal["live", "sample", "record", "replay"] = "sample"
+    delta: bool = False
+    distributed: bool = False
+    limit: int | None = Field(default=None, ge=1)
+    profile: bool = False
+    deadline_ms: int | None = Field(default=None, ge=1)
 
 
 class ScanResultRow(BaseModel):
@@ -29,11 +34,110 @@ class ScanResultRow(BaseModel):
 
 
 class ScanResponse(BaseModel):
+    scan_id: str | None = None
     universe: str
     mode: str
     row_count: int
     columns: list[str]
     results: list[ScanResultRow]
+    reused_count: int | None = None
+    profile_id: str | None = None
+    timed_out_tickers: list[str] = Field(default_factory=list)
+    pending_tickers: list[str] = Field(default_factory=list)
+
+
+class ResultsPage(BaseModel):
+    scan_id: str
+    sort: str
+    order: Literal["asc", "desc"]
+    row_count: int
+    results: list[ScanResultRow]
+    next_cursor: str | None = None
+
+
+class HistoryScan(BaseModel):
+    scan_id: str
+    timestamp: str
+    day: str
+    universe: str
+    mode: str
+
+
+class HistoryRow(ScanResultRow):
+    rank: int
+
+
+class StoredScan(HistoryScan):
+    results: list[HistoryRow]
+
+
+class HistoryPoint(HistoryRow):
+    scan_id: str
+    timestamp: str
+    day: str
+    universe: str
+    mode: str
+
+
+class TickerHistoryResponse(BaseModel):
+    ticker: str
+    points: list[HistoryPoint]
+
+
+class EnteredTopRow(BaseModel):
+    ticker: str
+    entered_at: str
+    entered_scan_id: str
+    entered_rank: int
+    current_rank: int | None = None
+    score: int
+    reasons: list[str] = Field(default_factory=list)
+
+
+class EnteredTopResponse(BaseModel):
+    universe: str
+    day: str
+    top: int
+    baseline_scan_id: str | None = None
+    scans_today: int
+    tickers: list[EnteredTopRow]
+
+
+class AllocationSite(BaseModel):
+    location: str
+    size_bytes: int
+    count: int
+
+
+class ProfileResponse(BaseModel):
+    profile_id: str
+    scan: dict[str, Any]
+    started_at: str
+    duration_s: float
+    sample_interval_ms: float
+    samples: int
+    peak_traced_bytes: int
+    allocations: list[AllocationSite]
+    collapsed: str
+
+
+class BarSeries(BaseModel):
+    timestamps: list[str]
+    open: list[float | None]
+    high: list[float | None]
+    low: list[float | None]
+    close: list[float | None]
+    volume: list[float | None]
+    overlays: dict[str, list[float | None]] = Field(default_factory=dict)
+    source_points: int
+
+
+class TickerBarsResponse(BaseModel):
+    ticker: str
+    mode: str
+    method: str
+    daily: BarSeries
+    premarket: BarSeries
 
 
 class HealthResponse(BaseModel):
@@ -1,39 +1,381 @@
 from __future__ import annotations
 
+import asyncio
+import collections
 import io
+import threading
+import uuid
+from datetime import date
 from typing import Any
 
+import numpy as np
 import pandas as pd
 
-from api.scanner.config import load_config
-from api.scanner.engine import run_scan
+from api.scanner.cache import PROFILES, RESULTS, SCANS, build_cache, cache_ttl
+from api.scanner.config import config_fingerprint, load_config
+from api.scanner.delta import DeltaState
+from api.scanner.distributed import MultiprocessingBroker, QueueBroker, run_distributed_scan
+from api.scanner.downsample import downsample
+from api.scanner.engine import DataProvider, run_scan_async, timeframe_rules
+from api.scanner.expressions import compile_rules
+from api.scanner.history import build_history
+from api.scanner.ingest import stored_prices
+from api.scanner.profiling import capture_profile
+from api.scanner.providers import open_http_client
+from api.scanner.results import ScanResults, decode_cursor, encode_cursor, query_fingerprint
+from api.scanner.singleflight import AsyncSingleFlight
 from api.scanner.universes import UniverseNotFoundError, list_universe_options, load_universe
 
 
+class TickerNotFoundError(ValueError):
+    pass
+
+
+class ScanResultsNotFoundError(ValueError):
+    pass
+
+
+class ProfileNotFoundError(ValueError):
+    pass
+
+
+class HistoryNotFoundError(ValueError):
+    pass
+
+
+class ScanOptionsError(ValueError):
+    pass
+
+
 class ScannerService:
-    def __init__(self) -> None:
-        self.cfg = load_config()
+    def __init__(self, cfg: dict[str, Any] | None = None) -> None:
+        self.cfg = load_config() if cfg is None else cfg
+        self.cfg_key = config_fingerprint(self.cfg)
+        compile_rules(self.cfg)
+        timeframe_rules(self.cfg)
+        self.cache = build_cache(self.cfg)
+        self.history = build_history(self.cfg)
+        self._scan_flights = AsyncSingleFlight()
+        self._delta_states: dict[str, DeltaState] = {}
+        self._broker: QueueBroker | None = None
+        self._broker_lock = threading.Lock()
+        self._results: collections.OrderedDict[str, ScanResults] = collections.OrderedDict()
+        self._profiles: collections.OrderedDict[str, dict[str, Any]] = collections.OrderedDict()
+        self._results_lock = threading.Lock()
+        self._http: Any | None = None
+        self._http_loop: asyncio.AbstractEventLoop | None = None
+
+    async def startup(self) -> None:
+        """Open the pooled HTTP client that every scan on this loop shares."""
+        if self._http is None:
+            self._http = open_http_client(self.cfg)
+            self._http_loop = asyncio.get_running_loop()
+
+    async def shutdown(self) -> None:
+        if self._http is not None:
+            await self._http.aclose()
+        self._http = None
+        self._http_loop = None
+
+    def _client(self) -> Any | None:
+        # A client is bound to the loop it was opened on; scans started from
+        # run_scan get their own loop and a client scoped to that scan.
+        return self._http if self._http_loop is asyncio.get_running_loop() else None
 
     def get_universes(self) -> list[dict[str, Any]]:
         return list_universe_options()
 
-    def run_scan(self, universe: str, mode: str) -> dict[str, Any]:
+    def run_scan(
+        self,
+        universe: str,
+        mode: str,
+        delta: bool = False,
+        distributed: bool = False,
+        limit: int | None = None,
+        profile: bool = False,
+        deadline_ms: int | None = None,
+    ) -> dict[str, Any]:
+        return asyncio.run(
+            self.run_scan_async(universe, mode, delta=delta, distributed=distributed, limit=limit, profile=profile, deadline_ms=deadline_ms)
+        )
+
+    async def run_scan_async(
+        self,
+        universe: str,
+        mode: str,
+        delta: bool = False,
+        distributed: bool = False,
+        limit: int | None = None,
+        profile: bool = False,
+        deadline_ms: int | None = None,
+    ) -> dict[str, Any]:
+        if deadline_ms is not None and distributed:
+            raise ScanOptionsError("deadline_ms applies to single-process scans; distributed scans use distributed.shard_timeout_s")
+        if delta and distributed:
+            raise ScanOptionsError("delta applies to single-process scans; delta state is not shared with distributed workers")
+        if profile:
+            # Profiled scans always run: a coalesced or cached payload would
+            # leave nothing to measure.
+            payload = await self._profiled_scan(universe, mode, delta=delta, distributed=distributed, deadline_ms=deadline_ms)
+        elif deadline_ms is not None:
+            # Joining a scan without the same deadline could wait past this one.
+            key = (universe, mode, self.cfg_key, "delta" if delta else "full", deadline_ms)
+            payload = await self._scan_flights.do(key, self._deadline_scan, universe, mode, delta, deadline_ms)
+        elif distributed:
+            payload = await self._scan_flights.do((universe, mode, self.cfg_key), self._cached_scan, universe, mode, True)
+        elif delta:
+            # Delta scans are their own reuse mechanism; a cached payload would
+            # hide newly arrived bars until the scan TTL expires.
+            payload = await self._scan_flights.do((universe, mode, self.cfg_key, "delta"), self._run_scan, universe, mode, True)
+        else:
+            payload = await self._scan_flights.do((universe, mode, self.cfg_key), self._cached_scan, universe, mode)
+        if limit is not None:
+            # The full ranking stays queryable through query_results(scan_id).
+            payload = {**payload, "results": payload["results"][:limit]}
+        return payload
+
+    async def _profiled_scan(self, universe: str, mode: str, delta: bool, distributed: bool, deadline_ms: int | None = None) -> dict[str, Any]:
+        with capture_profile(self.cfg) as profile:
+            payload = await self._run_scan(universe, mode, delta=delta, distributed=distributed, deadline_ms=deadline_ms)
+        profile["scan"] = {
+            "scan_id": payload["scan_id"],
+            "universe": universe,
+            "mode": mode,
+            "delta": delta,
+            "distributed": distributed,
+            "deadline_ms": deadline_ms,
+        }
+        keep = int((self.cfg.get("profiling") or {}).get("max_stored", 16))
+        with self._results_lock:
+            self._keep_recent(self._profiles, profile["profile_id"], profile, keep)
+        await asyncio.to_thread(self.cache.set, PROFILES, profile["profile_id"], profile, cache_ttl(self.cfg, PROFILES))
+        return {**payload, "profile_id": profile["profile_id"]}
+
+    async def get_profile(self, profile_id: str) -> dict[str, Any]:
+        with self._results_lock:
+            profile = self._profiles.get(profile_id)
+        if profile is None:
+            profile = await asyncio.to_thread(self.cache.get, PROFILES, profile_id)
+        if profile is None:
+            raise ProfileNotFoundError(f"Unknown or expired profile: {profile_id}")
+        return profile
+
+    @staticmethod
+    def _keep_recent(store: collections.OrderedDict[str, Any], key: str, value: Any, keep: int) -> None:
+        store[key] = value
+        while len(store) > keep:
+            store.popitem(last=False)
+
+    async def _cached_scan(self, universe: str, mode: str, distributed: bool = False) -> dict[str, Any]:
+        # Distributed and single-process scans produce identical results, so
+        # they share a flight and a cache entry.
+        return await self.cache.get_or_set_async(
+            SCANS,
+            f"{universe}:{mode}:{self.cfg_key}",
+            lambda: self._run_scan(universe, mode, distributed=distributed),
+            ttl=cache_ttl(self.cfg, SCANS),
+        )
+
+    async def _deadline_scan(self, universe: str, mode: str, delta: bool, deadline_ms: int) -> dict[str, Any]:
+        key = f"{universe}:{mode}:{self.cfg_key}"
+        if not delta:
+            cached = await asyncio.to_thread(self.cache.get, SCANS, key)
+            if cached is not None:
+                return cached
+        payload = await self._run_scan(universe, mode, delta=delta, deadline_ms=deadline_ms)
+        if not delta and not payload["timed_out_tickers"] and not payload["pending_tickers"]:
+            # Finished in time, so it is the same payload a full scan would cache.
+            await asyncio.to_thread(self.cache.set, SCANS, key, payload, cache_ttl(self.cfg, SCANS))
+        return payload
+
+    async def _run_scan(
+        self,
+        universe: str,
+        mode: str,
+        delta: bool = False,
+        distributed: bool = False,
+        deadline_ms: int | None = None,
+    ) -> dict[str, Any]:
         try:
             tickers = load_universe(universe)
         except UniverseNotFoundError:
             raise
-        dataframe = run_scan(tickers, self.cfg, mode=mode)
+        if distributed:
+            dataframe = await asyncio.to_thread(run_distributed_scan, tickers, self.cfg, mode, self._get_broker())
+        else:
+            state = self._delta_states.setdefault(mode, DeltaState()) if delta else None
+            dataframe = await run_scan_async(
+                tickers, self.cfg, mode=mode, cache=self.cache, delta=state, client=self._client(), deadline_ms=deadline_ms
+            )
         normalized = self._normalize_dataframe(dataframe)
+        results = ScanResults(uuid.uuid4().hex, normalized.to_dict(orient="records"))
+        await self._store_results(results)
+        timed_out = list(dataframe.attrs.get("timed_out", []))
+        pending = list(dataframe.attrs.get("pending", []))
+        # A ranking cut short by its deadline would read as tickers dropping out of the top.
+        if self.history is not None and not timed_out and not pending:
+            try:
+                await asyncio.to_thread(self.history.append, results.scan_id, results.rows, universe, mode)
+            except OSError:
+                # Losing one history entry (full disk, read-only volume) must not fail the scan.
+                pass
         return {
+            "scan_id": results.scan_id,
             "universe": universe,
             "mode": mode,
             "row_count": len(normalized),
             "columns": list(normalized.columns),
-            "results": normalized.to_dict(orient="records"),
+            "results": results.rows,
+            "reused_count": dataframe.attrs.get("reused", 0) if delta else None,
+            "timed_out_tickers": timed_out,
+            "pending_tickers": pending,
         }
 
+    async def _store_results(self, results: ScanResults) -> None:
+        keep = int((self.cfg.get("results") or {}).get("max_stored", 32))
+        with self._results_lock:
+            self._keep_recent(self._results, results.scan_id, results, keep)
+        # Shared cache backends let any worker serve pages of this scan.
+        await asyncio.to_thread(self.cache.set, RESULTS, results.scan_id, results, cache_ttl(self.cfg, RESULTS))
+
+    async def _load_results(self, scan_id: str) -> ScanResults:
+        with self._results_lock:
+            results = self._results.get(scan_id)
+        if results is None:
+            results = await asyncio.to_thread(self.cache.get, RESULTS, scan_id)
+        if results is None:
+            raise ScanResultsNotFoundError(f"Unknown or expired scan: {scan_id}")
+        return results
+
+    async def query_results(
+        self,
+        scan_id: str,
+        sort: str = "rank",
+        descending: bool = False,
+        ranges: dict[str, tuple[float | None, float | None]] | None = None,
+        reasons: list[str] | None = None,
+        limit: int = 50,
+        cursor: str | None = None,
+    ) -> dict[str, Any]:
+        """One page of a stored scan, sorted and filtered; raises ``CursorError`` for a foreign cursor."""
+        results = await self._load_results(scan_id)
+        ranges = {key: bounds for key, bounds in (ranges or {}).items() if bounds != (None, None)}
+        reasons = reasons or []
+        fingerprint = query_fingerprint(sort, descending, ranges, reasons)
+        position = decode_cursor(cursor, fingerprint) if cursor else 0
+        rows, next_position = results.page(sort, descending, ranges, reasons, limit, position)
+        return {
+            "scan_id": scan_id,
+            "sort": sort,
+            "order": "desc" if descending else "asc",
+            "row_count": len(results),
+            "results": rows,
+            "next_cursor": encode_cursor(next_position, fingerprint) if next_position is not None else None,
+        }
+
+    async def ticker_bars(
+        self,
+        symbol: str,
+        mode: str,
+        max_points: int = 500,
+        method: str = "ohlc",
+        start: date | None = None,
+        end: date | None = None,
+    ) -> dict[str, Any]:
+        """Daily and premarket bars for one ticker, downsampled to ``max_points`` each."""
+        ticker = symbol.strip().upper()
+        provider = DataProvider(self.cfg, mode=mode, cache=self.cache)
+        pkg = await asyncio.to_thread(provider.recent_package, ticker) or await provider.fetch_async(ticker, self._client())
+        if "error" in pkg:
+            raise TickerNotFoundError(f"No bars for {ticker}: {pkg['error']}")
+        daily = pkg["daily"]
+        return {
+            "ticker": ticker,
+            "mode": mode,
+            "method": method,
+            "daily": self._bar_series(daily, [name for name in daily.columns if name.startswith("SMA")], max_points, method, start, end),
+            "premarket": self._bar_series(pkg["pre"], ["VWAP"], max_points, method, start, end),
+        }
+
+    @staticmethod
+    def _bar_series(
+        frame: pd.DataFrame | None,
+        overlays: list[str],
+        max_points: int,
+        method: str,
+        start: date | None,
+        end: date | None,
+    ) -> dict[str, Any]:
+        if frame is None or frame.empty:
+            frame = pd.DataFrame(columns=["Open", "High", "Low", "Close", "Volume", *overlays], index=pd.DatetimeIndex([]))
+        overlays = [name for name in overlays if name in frame]
+        dates = frame.index.date if len(frame) else np.array([], dtype=object)
+        keep = np.ones(len(frame), dtype=bool)
+        if start is not None:
+            keep &= dates >= start
+        if end is not None:
+            keep &= dates <= end
+        frame = frame.loc[keep]
+        sampled = downsample(frame, max_points, method, overlays)
+
+        def values(name: str) -> list[float | None]:
+            column = sampled[name].to_numpy(dtype=np.float64)
+            return [None if np.isnan(value) else float(value) for value in column]
+
+        def prices(name: str) -> list[float | None]:
+            return stored_prices(sampled[name].to_numpy(dtype=np.float64))
+
+        return {
+            "timestamps": [stamp.isoformat() for stamp in sampled.index],
+            "open": prices("Open"),
+            "high": prices("High"),
+            "low": prices("Low"),
+            "close": prices("Close"),
+            "volume": values("Volume"),
+            "overlays": {name: values(name) for name in overlays},
+            "source_points": len(frame),
+        }
+
+    def _history(self):
+        if self.history is None:
+            raise HistoryNotFoundError("Scan history is disabled (history.enabled in config.yaml)")
+        return self.history
+
+    async def ticker_history(
+        self,
+        symbol: str,
+        limit: int = 30,
+        universe: str | None = None,
+        mode: str | None = None,
+        per_day: bool = True,
+    ) -> dict[str, Any]:
+        ticker = symbol.strip().upper()
+        points = await asyncio.to_thread(self._history().ticker_history, ticker, limit, universe, mode, per_day)
+        return {"ticker": ticker, "points": points}
+
+    async def entered_top(self, universe: str, top: int = 20, day: date | None = None, mode: str | None = None) -> dict[str, Any]:
+        return await asyncio.to_thread(self._history().entered_top, universe, top, day, mode)
+
+    async def history_scans(self, universe: str | None = None, mode: str | None = None, limit: int = 50) -> list[dict[str, Any]]:
+        return await asyncio.to_thread(self._history().scans, universe, mode, limit)
+
+    async def history_scan(self, scan_id: str) -> dict[str, Any]:
+        scan = await asyncio.to_thread(self._history().scan, scan_id)
+        if scan is None:
+            raise HistoryNotFoundError(f"No stored scan: {scan_id}")
+        return scan
+
+    def _get_broker(self) -> QueueBroker:
+        with self._broker_lock:
+            if self._broker is None:
+                self._broker = MultiprocessingBroker((self.cfg.get("distributed") or {}).get("workers"))
+            return self._broker
+
     def export_csv(self, universe: str, mode: str) -> bytes:
-        payload = self.run_scan(universe, mode)
+        return asyncio.run(self.export_csv_async(universe, mode))
+
+    async def export_csv_async(self, universe: str, mode: str) -> bytes:
+        payload = await self.run_scan_async(universe, mode)
         dataframe = pd.DataFrame(payload["results"])
         if "reasons" in dataframe:
             dataframe["reasons"] = dataframe["reasons"].apply(lambda value: "; ".join(value) if isinstance(value, list) else value)
@@ -1,10 +1,64 @@
 from __future__ import annotations
 
+import argparse
+import asyncio
+import json
+from pathlib import Path
 
-def main() -> int:
+
+def _scan(args: argparse.Namespace) -> int:
+    from api.scanner.config import ROOT_DIR
+    from api.services.scanner_service import scanner_service
+
+    async def run() -> tuple[dict, dict | None]:
+        payload = await scanner_service.run_scan_async(
+            args.universe, args.mode, delta=args.delta, profile=args.profile, deadline_ms=args.deadline_ms
+        )
+        profile = await scanner_service.get_profile(payload["profile_id"]) if args.profile else None
+        return payload, profile
+
+    payload, profile = asyncio.run(run())
+    for rank, row in enumerate(payload["results"][: args.top], start=1):
+        print(f"{rank:>4}  {row['ticker']:<8} {row['score']:>3}  {'; '.join(row['reasons'])}")
+    print(f"{payload['row_count']} rows, scan {payload['scan_id']}")
+    unfinished = payload.get("timed_out_tickers", []) + payload.get("pending_tickers", [])
+    if unfinished:
+        print(f"deadline passed with {len(unfinished)} tickers unfetched: {', '.join(unfinished[:20])}{' ...' if len(unfinished) > 20 else ''}")
+
+    if profile is not None:
+        out_dir = Path(args.profile_dir or (scanner_service.cfg.get("profiling") or {}).get("dir", ".cache/profiles"))
+        out_dir = out_dir if out_dir.is_absolute() else ROOT_DIR / out_dir
+        out_dir.mkdir(parents=True, exist_ok=True)
+        stacks = out_dir / f"{profile['profile_id']}.collapsed"
+        stacks.write_text(profile["collapsed"] + "\n", encoding="utf-8")
+        summary = {key: value for key, value in profile.items() if key != "collapsed"}
+        (out_dir / f"{profile['profile_id']}.json").write_text(json.dumps(summary, indent=2), encoding="utf-8")
+        print(f"profile {profile['profile_id']}: {profile['duration_s']:.2f}s, {profile['samples']} samples, peak {profile['peak_traced_bytes'] / 1e6:.1f} MB")
+        for site in profile["allocations"][:5]:
+            print(f"  {site['size_bytes'] / 1e6:8.2f} MB  {site['location']}")
+        print(f"collapsed stacks: {stacks}")
+    return 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Stock trend scanner helper.")
+    commands = parser.add_subparsers(dest="command")
+    scan = commands.add_parser("scan", help="run one scan from the command line")
+    scan.add_argument("--universe", default="demo_sample.csv")
+    scan.add_argument("--mode", default="sample", choices=["live", "sample", "record", "replay"])
+    scan.add_argument("--delta", action="store_true")
+    scan.add_argument("--deadline-ms", type=int, help="rank whatever has been fetched after this many milliseconds")
+    scan.add_argument("--top", type=int, default=20, help="rows to print")
+    scan.add_argument("--profile", action="store_true", help="profile this scan and write its stacks and allocations")
+    scan.add_argument("--profile-dir", help="where to write profiles (default: profiling.dir in config.yaml)")
+    args = parser.parse_args(argv)
+
+    if args.command == "scan":
+        return _scan(args)
     print(
         "The desktop PySide6 UI has been isolated.\n"
         "Run `python -m uvicorn api.main:app --reload` for the backend, `cd web && npm run dev` for the frontend,\n"
+        "`python app.py scan --universe demo_sample.csv` for a command-line scan,\n"
         "or `python legacy/desktop_app.py` for the legacy desktop app."
     )
     return 0
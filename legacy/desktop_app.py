@@ -1,13 +1,15 @@
 from __future__ import annotations
 
+import asyncio
 import sys
 from datetime import date
+from typing import Any
 
 import pandas as pd
 from PySide6 import QtCore, QtGui, QtWidgets
 
 from api.scanner.config import load_config
-from api.scanner.engine import run_scan
+from api.scanner.engine import run_scan_async
 from api.scanner.universes import load_universe
 
 APP_TITLE = "Morning Uptrend Scanner (Legacy Desktop)"
@@ -69,6 +71,63 @@ class ResultsModel(QtCore.QAbstractTableModel):
             return self.HEADERS[section]
         return None
 
+    def append_rows(self, rows: list[dict[str, object]]) -> None:
+        if not rows:
+            return
+        first = len(self.rows)
+        self.beginInsertRows(QtCore.QModelIndex(), first, first + len(rows) - 1)
+        self.rows.extend(rows)
+        self.endInsertRows()
+
+    def set_rows(self, rows: list[dict[str, object]]) -> None:
+        self.beginResetModel()
+        self.rows = list(rows)
+        self.endResetModel()
+
+
+class ScanWorker(QtCore.QThread):
+    """Runs one scan on its own event loop off the GUI thread; ``cancel`` is safe from any thread."""
+
+    rows_ready = QtCore.Signal(list, int)
+    completed = QtCore.Signal(object)
+    failed = QtCore.Signal(str)
+    cancelled = QtCore.Signal()
+
+    def __init__(self, tickers: list[str], cfg: dict[str, Any], mode: str, parent: QtCore.QObject | None = None):
+        super().__init__(parent)
+        self.tickers = tickers
+        self.cfg = cfg
+        self.mode = mode
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._task: asyncio.Task | None = None
+        self._cancel_requested = False
+
+    def run(self) -> None:  # type: ignore[override]
+        try:
+            result = asyncio.run(self._scan())
+        except asyncio.CancelledError:
+            self.cancelled.emit()
+        except Exception as exc:
+            self.failed.emit(str(exc))
+        else:
+            self.completed.emit(result)
+
+    async def _scan(self) -> pd.DataFrame:
+        self._loop = asyncio.get_running_loop()
+        self._task = asyncio.current_task()
+        if self._cancel_requested:
+            raise asyncio.CancelledError
+        return await run_scan_async(self.tickers, self.cfg, mode=self.mode, on_rows=self.rows_ready.emit)
+
+    def cancel(self) -> None:
+        self._cancel_requested = True
+        loop, task = self._loop, self._task
+        if loop is not None and task is not None:
+            try:
+                loop.call_soon_threadsafe(task.cancel)
+            except RuntimeError:
+                pass  # the loop already finished
+
 
 class MainWindow(QtWidgets.QMainWindow):
     def __init__(self):
@@ -76,6 +135,8 @@ class MainWindow(QtWidgets.QMainWindow):
         self.setWindowTitle(APP_TITLE)
         self.resize(1100, 650)
         self.cfg = load_config()
+        self.worker: ScanWorker | None = None
+        self._scan_size = 0
         self._build_ui()
         self._apply_dark_theme()
 
@@ -103,6 +164,11 @@ class MainWindow(QtWidgets.QMainWindow):
         self.run_btn.clicked.connect(self.on_run)
         top.addWidget(self.run_btn)
 
+        self.cancel_btn = QtWidgets.QPushButton("Cancel")
+        self.cancel_btn.clicked.connect(self.on_cancel)
+        self.cancel_btn.setEnabled(False)
+        top.addWidget(self.cancel_btn)
+
         self.export_btn = QtWidgets.QPushButton("Export CSV")
         self.export_btn.clicked.connect(self.on_export)
         self.export_btn.setEnabled(False)
@@ -134,16 +200,59 @@ class MainWindow(QtWidgets.QMainWindow):
         self.table.setStyleSheet("QHeaderView::section { background-color: #2c2c2c; color: #e6e6e6; }")
 
     def on_run(self) -> None:
+        if self.worker is not None:
+            return
         tickers = load_universe(self.universe_combo.currentText())
         mode = "sample" if "Sample" in self.data_combo.currentText() else "live"
+        self._scan_size = len(tickers)
+        self.model.set_rows([])
+        self.export_btn.setEnabled(False)
+        self.run_btn.setEnabled(False)
+        self.cancel_btn.setEnabled(True)
         self.status_label.setText(f"Running scan on {len(tickers)} symbols...")
-        QtWidgets.QApplication.processEvents()
-        dataframe = run_scan(tickers, self.cfg, mode=mode)
-        rows = dataframe.to_dict(orient="records")
-        self.model = ResultsModel(rows)
-        self.table.setModel(self.model)
-        self.export_btn.setEnabled(bool(rows))
-        self.status_label.setText(f"Scan complete: {len(rows)} rows")
+
+        self.worker = ScanWorker(tickers, self.cfg, mode, parent=self)
+        self.worker.rows_ready.connect(self.on_rows)
+        self.worker.completed.connect(self.on_completed)
+        self.worker.failed.connect(self.on_failed)
+        self.worker.cancelled.connect(self.on_cancelled)
+        self.worker.finished.connect(self.on_worker_finished)
+        self.worker.start()
+
+    def on_cancel(self) -> None:
+        if self.worker is not None:
+            self.cancel_btn.setEnabled(False)
+            self.status_label.setText("Cancelling...")
+            self.worker.cancel()
+
+    def on_rows(self, rows: list[dict[str, object]], done: int) -> None:
+        self.model.append_rows(rows)
+        self.status_label.setText(f"Scanned {done}/{self._scan_size} symbols, {self.model.rowCount()} scored...")
+
+    def on_completed(self, dataframe: pd.DataFrame) -> None:
+        # Streamed rows arrive in completion order; show the final ranking.
+        self.model.set_rows(dataframe.to_dict(orient="records"))
+        self.status_label.setText(f"Scan complete: {self.model.rowCount()} rows")
+
+    def on_cancelled(self) -> None:
+        self.status_label.setText(f"Scan cancelled: {self.model.rowCount()} rows scored before cancelling (unranked)")
+
+    def on_failed(self, message: str) -> None:
+        self.status_label.setText(f"Scan failed: {message}")
+
+    def on_worker_finished(self) -> None:
+        if self.worker is not None:
+            self.worker.deleteLater()
+        self.worker = None
+        self.run_btn.setEnabled(True)
+        self.cancel_btn.setEnabled(False)
+        self.export_btn.setEnabled(self.model.rowCount() > 0)
+
+    def closeEvent(self, event) -> None:  # type: ignore[override]
+        if self.worker is not None:
+            self.worker.cancel()
+            self.worker.wait()
+        super().closeEvent(event)
 
     def on_export(self) -> None:
         dataframe = pd.DataFrame(self.model.rows)
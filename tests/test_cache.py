@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from api.scanner.cache import DiskCache, file_lock
+
+
+def _files(root: Path, suffix: str) -> list[Path]:
+    return [path for path in root.rglob(f"*{suffix}")]
+
+
+def test_sweep_removes_only_expired_entries(tmp_path: Path) -> None:
+    cache = DiskCache(tmp_path, sweep_interval_s=0)
+    cache.set("results", "old", {"rows": 1}, ttl=0.01)
+    cache.set("results", "fresh", {"rows": 2}, ttl=3600)
+    cache.set("profiles", "forever", {"rows": 3})
+    time.sleep(0.05)
+    assert cache.sweep() == 1
+    assert len(_files(tmp_path, ".bin")) == 2
+    assert cache.get("results", "fresh") == {"rows": 2}
+    assert cache.get("profiles", "forever") == {"rows": 3}
+
+
+def test_writes_sweep_on_their_interval(tmp_path: Path) -> None:
+    cache = DiskCache(tmp_path, sweep_interval_s=0.05)
+    for key in range(5):
+        cache.set("results", str(key), key, ttl=0.01)
+    time.sleep(0.1)
+    cache.set("results", "new", "kept", ttl=3600)
+    assert [path.name for path in _files(tmp_path, ".bin")] == [cache._path("results", "new").name]
+
+
+def test_get_or_set_async_leaves_no_lock_files(tmp_path: Path) -> None:
+    cache = DiskCache(tmp_path)
+    calls = 0
+
+    async def compute() -> int:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return 42
+
+    async def main() -> list[int]:
+        return await asyncio.gather(*(cache.get_or_set_async("bars", f"k{key}", compute) for key in range(4)))
+
+    assert asyncio.run(main()) == [42] * 4
+    assert asyncio.run(main()) == [42] * 4
+    assert calls == 4
+    assert _files(tmp_path, ".lock") == []
+
+
+def test_same_key_misses_share_one_computation(tmp_path: Path) -> None:
+    # More waiters than executor threads used to leave none for the holder.
+    cache = DiskCache(tmp_path)
+    calls = 0
+
+    async def compute() -> int:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return 42
+
+    async def main() -> list[int]:
+        asyncio.get_running_loop().set_default_executor(ThreadPoolExecutor(2))
+        misses = asyncio.gather(*(cache.get_or_set_async("bars", "same", compute) for _ in range(16)))
+        return await asyncio.wait_for(misses, timeout=5)
+
+    assert asyncio.run(main()) == [42] * 16
+    assert calls == 1
+
+
+def test_removed_lock_files_still_exclude(tmp_path: Path) -> None:
+    path = tmp_path / "key.lock"
+    inside = 0
+    overlap = False
+
+    def worker() -> None:
+        nonlocal inside, overlap
+        for _ in range(50):
+            with file_lock(path, remove=True):
+                inside += 1
+                overlap |= inside > 1
+                time.sleep(0.0005)
+                inside -= 1
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert not overlap
+    assert not path.exists()
@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import queue
+import threading
+import time
+
+import pytest
+
+from api.scanner import distributed
+from api.scanner.config import load_config
+from api.scanner.distributed import QueueBroker, ShardFailedError, ThreadBroker, run_distributed_scan, worker_loop
+
+
+def _slow_shard(seconds: float, fail: bool = False):
+    def scan_shard(tickers, cfg, mode):
+        time.sleep(seconds)
+        if fail:
+            raise RuntimeError("worker broke")
+        return [{"ticker": ticker, "score": 1, "rel_dollar_vol": 1.0, "gap_pct": 1.0} for ticker in tickers]
+
+    return scan_shard
+
+
+def _cfg(shard_timeout_s: float) -> dict:
+    cfg = load_config()
+    cfg["distributed"] = {"shard_size": 1, "max_retries": 1, "shard_timeout_s": shard_timeout_s}
+    return cfg
+
+
+def test_queued_shards_do_not_time_out(monkeypatch: pytest.MonkeyPatch) -> None:
+    # Five 0.3 s shards on one worker take 1.5 s, three times the shard timeout.
+    monkeypatch.setattr(distributed, "scan_shard", _slow_shard(0.3))
+    monkeypatch.setattr(distributed, "rank_rows", lambda rows, cfg: sorted(row["ticker"] for row in rows))
+    broker = ThreadBroker(1)
+    try:
+        result = run_distributed_scan(["A", "B", "C", "D", "E"], _cfg(0.5), mode="sample", broker=broker)
+    finally:
+        broker.close()
+    assert result == ["A", "B", "C", "D", "E"]
+
+
+def test_running_shard_still_times_out(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(distributed, "scan_shard", _slow_shard(0.5))
+    broker = ThreadBroker(2)
+    try:
+        with pytest.raises(ShardFailedError, match="timed out"):
+            run_distributed_scan(["A"], _cfg(0.1), mode="sample", broker=broker)
+    finally:
+        broker.close()
+
+
+def test_failing_shard_is_retried_then_reported(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(distributed, "scan_shard", _slow_shard(0.0, fail=True))
+    broker = ThreadBroker(1)
+    try:
+        with pytest.raises(ShardFailedError, match="worker broke"):
+            run_distributed_scan(["A"], _cfg(5), mode="sample", broker=broker)
+    finally:
+        broker.close()
+
+
+def _dying_worker(tasks: queue.Queue, results: queue.Queue, lost: int) -> threading.Thread:
+    # Takes ``lost`` tasks without acknowledging them, as a worker killed right
+    # after ``tasks.get()`` would, then serves the rest normally.
+    def run() -> None:
+        for _ in range(lost):
+            tasks.get()
+        worker_loop(tasks, results)
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    return thread
+
+
+def test_shard_never_picked_up_fails(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(distributed, "scan_shard", _slow_shard(0.0))
+    tasks, results = queue.Queue(), queue.Queue()
+    broker = QueueBroker(tasks, results)
+    worker = _dying_worker(tasks, results, lost=2)
+    started = time.monotonic()
+    try:
+        with pytest.raises(ShardFailedError, match="never picked up"):
+            run_distributed_scan(["A"], _cfg(0.5), mode="sample", broker=broker)
+    finally:
+        tasks.put(None)
+        worker.join(timeout=5)
+    assert time.monotonic() - started < 3
+
+
+def test_lost_shard_is_resubmitted(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(distributed, "scan_shard", _slow_shard(0.0))
+    monkeypatch.setattr(distributed, "rank_rows", lambda rows, cfg: sorted(row["ticker"] for row in rows))
+    tasks, results = queue.Queue(), queue.Queue()
+    broker = QueueBroker(tasks, results)
+    worker = _dying_worker(tasks, results, lost=1)
+    try:
+        result = run_distributed_scan(["A", "B"], _cfg(0.5), mode="sample", broker=broker)
+    finally:
+        tasks.put(None)
+        worker.join(timeout=5)
+    assert result == ["A", "B"]
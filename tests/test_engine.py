@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+import asyncio
+import copy
+import time
+from typing import Any
+
+from api.scanner.cache import NullCache
+from api.scanner.config import load_config
+from api.scanner.engine import run_scan_async
+from api.scanner.providers import SampleSource
+
+
+class _SlowSource(SampleSource):
+    # Every ticker is a renamed copy of a sample ticker that takes 0.1 s to arrive.
+    name = "slow"
+
+    def __init__(self, cfg: dict[str, Any]) -> None:
+        super().__init__(cfg)
+        self._bars = {ticker: self.load(ticker) for ticker in ["AAPL", "MSFT", "NVDA"]}
+
+    @property
+    def key(self) -> str:
+        return f"slow:{id(self)}"
+
+    async def load_async(self, ticker: str, client: Any | None = None) -> dict[str, Any]:
+        await asyncio.sleep(0.1)
+        return {**self._bars[ticker.split("_")[0]], "ticker": ticker}
+
+
+def test_deadline_bounds_the_scan() -> None:
+    cfg = copy.deepcopy(load_config())
+    tickers = [f"{base}_{number}" for number in range(80) for base in ["AAPL", "MSFT", "NVDA"]]
+
+    async def scan() -> tuple[Any, float]:
+        started = time.monotonic()
+        result = await run_scan_async(tickers, cfg, mode="sample", cache=NullCache(), source=_SlowSource(cfg), deadline_ms=1000)
+        return result, time.monotonic() - started
+
+    result, elapsed = asyncio.run(scan())
+    assert elapsed < 1.25
+    unfinished = result.attrs["timed_out"] + result.attrs["pending"]
+    assert result.attrs["pending"] and unfinished
+    assert len(unfinished) < len(tickers)
+    assert not set(result["ticker"]) & set(unfinished)
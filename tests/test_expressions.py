@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import copy
+
+import pytest
+
+from api.scanner.config import load_config
+from api.scanner.expressions import BUILTIN_WEIGHTS, RuleError, compile_rules, evaluate_rules
+from api.scanner.ingest import compact_payload
+from api.scanner.panel import BarPanel
+from api.scanner.providers import SampleSource
+
+TICKERS = ["AAPL", "MSFT", "NVDA"]
+
+
+def _cfg(*rules: tuple[str, str]) -> dict:
+    cfg = copy.deepcopy(load_config())
+    cfg["rules"] = [{"name": name, "when": when} for name, when in rules]
+    cfg["scoring"]["weights"].update({name: 1 for name, _ in rules})
+    return cfg
+
+
+def _hits(cfg: dict) -> list[list[str]]:
+    bars = [compact_payload(SampleSource(cfg).load(ticker)) for ticker in TICKERS]
+    panel = BarPanel.from_bars(bars).compute(cfg["indicators"])
+    metrics = [{"gap_pct": 2.0, "price": 100.0} for _ in TICKERS]
+    return evaluate_rules(compile_rules(cfg), panel, metrics)
+
+
+def test_names_are_case_insensitive() -> None:
+    hits = _hits(_cfg(("lower", "gap_pct > 1 and close > sma20[1] * 0"), ("mixed", "GAP_PCT > 1 and Close > SMA20[1] * 0")))
+    assert hits == [["lower", "mixed"]] * len(TICKERS)
+
+
+def test_unconfigured_indicator_is_rejected() -> None:
+    with pytest.raises(RuleError, match="sma5"):
+        compile_rules(_cfg(("short_ma", "close > sma5")))
+    cfg = _cfg(("short_ma", "close > sma5 * 0"))
+    cfg["indicators"]["ma_periods"] = [5, 20]
+    assert _hits(cfg) == [["short_ma"]] * len(TICKERS)
+
+
+def test_rule_without_weight_is_rejected() -> None:
+    cfg = _cfg(("unweighted", "close > 0"))
+    del cfg["scoring"]["weights"]["unweighted"]
+    with pytest.raises(RuleError, match="scoring.weights"):
+        compile_rules(cfg)
+
+
+def test_unknown_name_is_rejected() -> None:
+    with pytest.raises(RuleError, match="Unknown name"):
+        compile_rules(_cfg(("typo", "clsoe > 0")))
+
+
+@pytest.mark.parametrize("name", ["volume_confirm", "uptrend_ma_stack", "hammer", "three_black_crows"])
+def test_builtin_weight_name_is_rejected(name: str) -> None:
+    with pytest.raises(RuleError, match="built-in"):
+        compile_rules(_cfg((name, "close > 0")))
+
+
+def test_builtin_weights_match_the_default_config() -> None:
+    assert set(load_config()["scoring"]["weights"]) == BUILTIN_WEIGHTS
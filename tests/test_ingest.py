@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from api.scanner.config import load_config
+from api.scanner.engine import DataProvider, evaluate, slice_premarket
+from api.scanner.indicators import add_atr, add_rsi, add_sma, vwap
+from api.scanner.ingest import BAR_COLUMNS, compact_payload, stored_price
+from api.scanner.providers import SAMPLE_DATA_DIR, SampleSource
+
+TICKERS = sorted(path.name.split("_")[0] for path in SAMPLE_DATA_DIR.glob("*_daily.csv"))
+
+
+def _float64_package(provider: DataProvider, raw: dict) -> dict:
+    """The package the scanner built before bars were compacted: float64 frames end to end."""
+    cfg = provider.cfg
+    daily = raw["daily"].set_index("Date")[BAR_COLUMNS].astype(np.float64)
+    for period in cfg["indicators"].get("ma_periods", [20, 50, 200]):
+        add_sma(daily, int(period))
+    add_rsi(daily, int(cfg["indicators"].get("rsi_period", 14)))
+    add_atr(daily, int(cfg["indicators"].get("atr_period", 14)))
+    window = cfg["premarket_window"]
+    pre = slice_premarket(raw["intra"][BAR_COLUMNS].astype(np.float64), window["start"], window["end"]).copy()
+    if not pre.empty:
+        pre["VWAP"] = vwap(pre)
+    return provider._package_payload(raw["ticker"], daily, pre)
+
+
+@pytest.mark.parametrize("ticker", TICKERS)
+def test_compact_pipeline_matches_float64(ticker: str) -> None:
+    cfg = load_config()
+    provider = DataProvider(cfg, mode="sample")
+    raw = SampleSource(cfg).load(ticker)
+    compact = provider.build_packages([compact_payload(raw)], cached=False)[0]
+    reference = _float64_package(provider, raw)
+    reference["rule_hits"] = compact.get("rule_hits", [])
+
+    assert list(compact["daily"].index) == list(reference["daily"].index)
+    for column in reference["daily"].columns:
+        np.testing.assert_allclose(compact["daily"][column], reference["daily"][column], rtol=1e-6, err_msg=column)
+    for column in ["Open", "High", "Low", "Close", "VWAP"]:
+        np.testing.assert_allclose(compact["pre"][column], reference["pre"][column], rtol=1e-6, err_msg=column)
+
+    for name, value in reference["metrics"].items():
+        tolerance = {"atol": 1e-5} if name == "gap_pct" else {"rtol": 1e-6}
+        np.testing.assert_allclose(compact["metrics"][name], value, err_msg=name, **tolerance)
+
+    compact_row, reference_row = evaluate(compact, cfg), evaluate(reference, cfg)
+    assert (compact_row is None) == (reference_row is None)
+    if compact_row is not None:
+        assert compact_row["score"] == reference_row["score"]
+        assert compact_row["reasons"] == reference_row["reasons"]
+
+
+def test_stored_price_recovers_quoted_decimal() -> None:
+    assert stored_price(float(np.float32(177.05))) == 177.05
+    assert stored_price(float(np.float32(254.079))) == 254.079
+    assert np.isnan(stored_price(np.nan))
@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Iterator
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from api.scanner.config import load_config
+from api.scanner.ingest import BAR_COLUMNS, compact_payload
+from api.scanner.providers import LiveSource, open_http_client
+
+# 09:30 New York on two trading days, and two premarket minutes of the second.
+DAILY_TS = [1704205800, 1704292200]
+INTRA_TS = [1704279600, 1704279660]
+
+
+def _chart(timestamps: list[int], close: list[float], adjclose: bool) -> dict[str, Any]:
+    indicators: dict[str, Any] = {
+        "quote": [
+            {
+                "open": [value - 1 for value in close],
+                "high": [value + 1 for value in close],
+                "low": [value - 2 for value in close],
+                "close": close,
+                "volume": [1000] * len(close),
+            }
+        ]
+    }
+    if adjclose:
+        indicators["adjclose"] = [{"adjclose": [value * 0.99 for value in close]}]
+    meta = {"exchangeTimezoneName": "America/New_York"}
+    return {"chart": {"result": [{"meta": meta, "timestamp": timestamps, "indicators": indicators}], "error": None}}
+
+
+class _ChartHandler(BaseHTTPRequestHandler):
+    def do_GET(self) -> None:
+        url = urlparse(self.path)
+        ticker = url.path.rsplit("/", 1)[-1]
+        interval = parse_qs(url.query)["interval"][0]
+        if ticker == "GOOD":
+            if interval == "1d":
+                body = _chart(DAILY_TS, [100.25, 101.5], adjclose=True)
+            else:
+                body = _chart(INTRA_TS, [101.0, 101.75], adjclose=False)
+            status = 200
+        elif ticker == "GONE":
+            body = {"chart": {"result": None, "error": {"code": "Not Found", "description": "No data found, symbol may be delisted"}}}
+            status = 404
+        else:
+            body = {"chart": {"result": None, "error": {"code": "Bad Request", "description": "Invalid symbol"}}}
+            status = 200
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+
+@pytest.fixture
+def live_cfg() -> Iterator[dict[str, Any]]:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _ChartHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    cfg = load_config()
+    cfg.setdefault("providers", {})["live"] = {"base_url": f"http://127.0.0.1:{server.server_port}", "timeout_s": 5}
+    try:
+        yield cfg
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def _load(cfg: dict[str, Any], ticker: str) -> dict[str, Any]:
+    async def main() -> dict[str, Any]:
+        client = open_http_client(cfg)
+        async with client:
+            return await LiveSource(cfg).load_async(ticker, client)
+
+    return asyncio.run(main())
+
+
+def test_chart_bars_match_the_yfinance_layout(live_cfg: dict[str, Any]) -> None:
+    bars = _load(live_cfg, "GOOD")
+    daily, intra = bars["daily"], bars["intra"]
+
+    assert list(daily.index) == [pd.Timestamp("2024-01-02"), pd.Timestamp("2024-01-03")]
+    assert daily.index.name == "Date" and daily.index.tz is None
+    assert list(daily.columns) == ["Open", "High", "Low", "Close", "Adj Close", "Volume"]
+    assert daily["Close"].tolist() == [100.25, 101.5]
+    assert str(intra.index.tz) == "America/New_York"
+    assert intra.index[0] == pd.Timestamp("2024-01-03 06:00", tz="America/New_York")
+    assert "Adj Close" not in intra.columns
+
+    compact = compact_payload(bars)
+    for name in ("daily", "intra"):
+        frame = compact[name].to_frame()
+        assert list(frame.columns) == BAR_COLUMNS
+        assert list(frame.index) == list(bars[name].index)
+        np.testing.assert_allclose(frame["Close"], bars[name]["Close"], rtol=1e-7)
+
+
+@pytest.mark.parametrize(("ticker", "message"), [("GONE", "404"), ("BAD", "Invalid symbol")])
+def test_chart_errors_become_fetch_errors(live_cfg: dict[str, Any], ticker: str, message: str) -> None:
+    bars = _load(live_cfg, ticker)
+    assert set(bars) == {"ticker", "error"}
+    assert message in bars["error"]
+    assert compact_payload(bars) is bars
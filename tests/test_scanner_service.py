@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import asyncio
+import copy
+from pathlib import Path
+
+import pytest
+
+from api.scanner import engine
+from api.scanner.cache import NullCache
+from api.scanner.config import load_config
+from api.scanner.ingest import CompactBars
+from api.scanner.providers import SampleSource
+from api.services.scanner_service import ScannerService, ScanOptionsError
+
+
+@pytest.fixture
+def service(tmp_path: Path) -> ScannerService:
+    cfg = copy.deepcopy(load_config())
+    cfg["history"] = {"enabled": True, "path": str(tmp_path / "history")}
+    return ScannerService(cfg)
+
+
+@pytest.mark.parametrize("options", [{"delta": True}, {"deadline_ms": 100}])
+def test_distributed_rejects_single_process_options(service: ScannerService, options: dict) -> None:
+    with pytest.raises(ScanOptionsError):
+        service.run_scan("demo_sample.csv", "sample", distributed=True, **options)
+
+
+def test_ticker_bars_serve_the_scanned_package(service: ScannerService, monkeypatch: pytest.MonkeyPatch) -> None:
+    payload = service.run_scan("demo_sample.csv", "sample")
+    ticker = payload["results"][0]["ticker"]
+
+    async def no_fetch(self, ticker, client=None):
+        raise AssertionError("ticker_bars fetched bars the scan already had")
+
+    monkeypatch.setattr(SampleSource, "load_async", no_fetch)
+    bars = asyncio.run(service.ticker_bars(ticker, "sample", max_points=5000))
+    assert bars["daily"]["close"][-1] == payload["results"][0]["price"]
+    assert bars["premarket"]["close"][-1] == payload["results"][0]["premarket_last"]
+
+
+def test_recent_bars_are_compact_and_bounded(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(engine, "_RECENT_BARS", engine.RecentBars())
+    cfg = copy.deepcopy(load_config())
+    cfg["fetch"]["recent_bars"] = 2
+    asyncio.run(engine.score_tickers_async(["AAPL", "MSFT", "NVDA"], cfg, mode="sample", cache=NullCache()))
+    kept = list(engine._RECENT_BARS._entries.values())
+    assert len(kept) == 2
+    assert all(isinstance(bars["daily"], CompactBars) and isinstance(bars["intra"], CompactBars) for bars in kept)
+
+
+def test_history_stays_under_its_configured_path(service: ScannerService, tmp_path: Path) -> None:
+    payload = service.run_scan("demo_sample.csv", "sample")
+    assert (tmp_path / "history" / "catalog.jsonl").exists()
+    scan = asyncio.run(service.history_scan(payload["scan_id"]))
+    assert [row["ticker"] for row in scan["results"]] == [row["ticker"] for row in payload["results"]]
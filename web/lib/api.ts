@@ -1,4 +1,13 @@
-import { ScanMode, ScanResponse, UniverseOption } from "@/types/scanner";
+import {
+  EnteredTopResponse,
+  ResultsPage,
+  ResultsQuery,
+  ScanMode,
+  ScanResponse,
+  TickerBarsResponse,
+  TickerHistoryResponse,
+  UniverseOption,
+} from "@/types/scanner";
 
 const API_BASE_URL = process.env.NEXT_PUBLIC_API_BASE_URL ?? "http://127.0.0.1:8000";
 
@@ -17,17 +26,57 @@ export async function fetchUniverses(): Promise<UniverseOption[]> {
   return parseResponse<UniverseOption[]>(response);
 }
 
-export async function runScan(universe: string, mode: ScanMode): Promise<ScanResponse> {
+export async function runScan(universe: string, mode: ScanMode, deadlineMs?: number): Promise<ScanResponse> {
   const response = await fetch(`${API_BASE_URL}/api/scanner/run`, {
     method: "POST",
     headers: {
       "Content-Type": "application/json",
     },
-    body: JSON.stringify({ universe, mode }),
+    body: JSON.stringify({ universe, mode, deadline_ms: deadlineMs }),
   });
   return parseResponse<ScanResponse>(response);
 }
 
+export async function queryResults(scanId: string, query: ResultsQuery = {}): Promise<ResultsPage> {
+  const params = new URLSearchParams();
+  for (const [key, value] of Object.entries(query)) {
+    if (value === undefined || value === null) continue;
+    for (const item of Array.isArray(value) ? value : [value]) {
+      params.append(key, String(item));
+    }
+  }
+  const response = await fetch(`${API_BASE_URL}/api/scanner/results/${encodeURIComponent(scanId)}?${params}`, {
+    cache: "no-store",
+  });
+  return parseResponse<ResultsPage>(response);
+}
+
+export async function fetchTickerBars(ticker: string, mode: ScanMode, maxPoints = 500): Promise<TickerBarsResponse> {
+  const params = new URLSearchParams({ mode, max_points: String(maxPoints) });
+  const response = await fetch(`${API_BASE_URL}/api/scanner/ticker/${encodeURIComponent(ticker)}/bars?${params}`, {
+    cache: "no-store",
+  });
+  return parseResponse<TickerBarsResponse>(response);
+}
+
+export async function fetchTickerHistory(ticker: string, limit = 30, universe?: string): Promise<TickerHistoryResponse> {
+  const params = new URLSearchParams({ limit: String(limit) });
+  if (universe) params.set("universe", universe);
+  const response = await fetch(`${API_BASE_URL}/api/scanner/history/ticker/${encodeURIComponent(ticker)}?${params}`, {
+    cache: "no-store",
+  });
+  return parseResponse<TickerHistoryResponse>(response);
+}
+
+export async function fetchEnteredTop(universe: string, top = 20, day?: string): Promise<EnteredTopResponse> {
+  const params = new URLSearchParams({ universe, top: String(top) });
+  if (day) params.set("day", day);
+  const response = await fetch(`${API_BASE_URL}/api/scanner/history/entered-top?${params}`, {
+    cache: "no-store",
+  });
+  return parseResponse<EnteredTopResponse>(response);
+}
+
 export async function exportScan(universe: string, mode: ScanMode): Promise<Blob> {
   const response = await fetch(`${API_BASE_URL}/api/scanner/export`, {
     method: "POST",
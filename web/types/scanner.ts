@@ -19,9 +19,100 @@ export interface ScanResultRow {
 }
 
 export interface ScanResponse {
+  scan_id?: string | null;
   universe: string;
   mode: ScanMode;
   row_count: number;
   columns: string[];
   results: ScanResultRow[];
+  reused_count?: number | null;
+  timed_out_tickers?: string[];
+  pending_tickers?: string[];
+}
+
+export type ResultsSortKey =
+  | "rank"
+  | "ticker"
+  | "score"
+  | "gap_pct"
+  | "rel_dollar_vol"
+  | "avg20_dollar_vol"
+  | "price"
+  | "premarket_last";
+
+export interface ResultsQuery {
+  sort?: ResultsSortKey;
+  order?: "asc" | "desc";
+  min_score?: number;
+  max_score?: number;
+  min_gap_pct?: number;
+  max_gap_pct?: number;
+  min_rel_dollar_vol?: number;
+  max_rel_dollar_vol?: number;
+  min_price?: number;
+  max_price?: number;
+  reason?: string[];
+  limit?: number;
+  cursor?: string;
+}
+
+export interface ResultsPage {
+  scan_id: string;
+  sort: ResultsSortKey;
+  order: "asc" | "desc";
+  row_count: number;
+  results: ScanResultRow[];
+  next_cursor: string | null;
+}
+
+export interface BarSeries {
+  timestamps: string[];
+  open: (number | null)[];
+  high: (number | null)[];
+  low: (number | null)[];
+  close: (number | null)[];
+  volume: (number | null)[];
+  overlays: Record<string, (number | null)[]>;
+  source_points: number;
+}
+
+export interface TickerBarsResponse {
+  ticker: string;
+  mode: ScanMode;
+  method: "ohlc" | "lttb";
+  daily: BarSeries;
+  premarket: BarSeries;
+}
+
+export interface HistoryPoint extends ScanResultRow {
+  rank: number;
+  scan_id: string;
+  timestamp: string;
+  day: string;
+  universe: string;
+  mode: string;
+}
+
+export interface TickerHistoryResponse {
+  ticker: string;
+  points: HistoryPoint[];
+}
+
+export interface EnteredTopRow {
+  ticker: string;
+  entered_at: string;
+  entered_scan_id: string;
+  entered_rank: number;
+  current_rank: number | null;
+  score: number;
+  reasons: string[];
+}
+
+export interface EnteredTopResponse {
+  universe: string;
+  day: string;
+  top: number;
+  baseline_scan_id: string | null;
+  scans_today: number;
+  tickers: EnteredTopRow[];
 }